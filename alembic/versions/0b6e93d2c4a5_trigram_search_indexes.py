@@ -0,0 +1,48 @@
+"""pg_trgm GIN indexes for trigram question search
+
+Revision ID: 0b6e93d2c4a5
+Revises: f27a6c3e9b14
+Create Date: 2026-10-18 15:08:44.931570
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6e93d2c4a5'
+down_revision: Union[str, None] = 'f27a6c3e9b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Restores the indexes efc042910b71 dropped, built without blocking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_questions_title_trgm',
+            'questions',
+            ['title'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_questions_body_trgm',
+            'questions',
+            ['body'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'body': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_questions_body_trgm', table_name='questions', postgresql_using='gin')
+    op.drop_index('idx_questions_title_trgm', table_name='questions', postgresql_using='gin')
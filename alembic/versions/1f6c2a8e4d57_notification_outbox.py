@@ -0,0 +1,38 @@
+"""Transactional outbox for notifications
+
+Revision ID: 1f6c2a8e4d57
+Revises: e5a0d7c3b618
+Create Date: 2026-10-18 19:34:52.287140
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '1f6c2a8e4d57'
+down_revision: Union[str, None] = 'e5a0d7c3b618'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_outbox',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('type', postgresql.ENUM(name='notificationtype', create_type=False), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('link', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('notification_outbox')
@@ -0,0 +1,59 @@
+"""Keyset pagination indexes for question listings
+
+Revision ID: 3c9d51a0be47
+Revises: 7e30f12eb912
+Create Date: 2026-10-18 09:12:40.512331
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d51a0be47'
+down_revision: Union[str, None] = '7e30f12eb912'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so the questions table stays writable while they build
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_questions_created_at_id',
+            'questions',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_questions_category_created_at_id',
+            'questions',
+            ['category_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_questions_author_created_at_id',
+            'questions',
+            ['author_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_question_tags_tag_question',
+            'question_tags',
+            ['tag_id', 'question_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_question_tags_tag_question', table_name='question_tags')
+    op.drop_index('idx_questions_author_created_at_id', table_name='questions')
+    op.drop_index('idx_questions_category_created_at_id', table_name='questions')
+    op.drop_index('idx_questions_created_at_id', table_name='questions')
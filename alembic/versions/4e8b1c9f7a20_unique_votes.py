@@ -0,0 +1,61 @@
+"""One vote per user and target
+
+Revision ID: 4e8b1c9f7a20
+Revises: 9d2f4b7a1e36
+Create Date: 2026-10-18 17:48:09.604113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e8b1c9f7a20'
+down_revision: Union[str, None] = '9d2f4b7a1e36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (vote table, target table, foreign key, constraint, reputation granted per
+# up and down vote when the vote was cast)
+VOTE_TABLES = [
+    ('question_votes', 'questions', 'question_id', 'uq_question_votes_user_question', 5, -1),
+    ('answer_votes', 'answers', 'answer_id', 'uq_answer_votes_user_answer', 10, -2),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, target, key, constraint, up, down in VOTE_TABLES:
+        # Keep each user's latest vote and take back from each author the
+        # reputation the dropped duplicates granted. A duplicate's value at
+        # cast time isn't recorded, so its current value is reversed. The
+        # reconcile job repairs the scores.
+        op.execute(
+            f"""
+            WITH dropped AS (
+                DELETE FROM {table} a
+                USING {table} b
+                WHERE a.user_id = b.user_id
+                  AND a.{key} = b.{key}
+                  AND (a.created_at, a.id) < (b.created_at, b.id)
+                RETURNING a.{key} AS target_id, a.vote_value
+            ),
+            granted AS (
+                SELECT t.author_id, SUM(CASE WHEN d.vote_value = 'up' THEN {up} ELSE {down} END) AS delta
+                FROM dropped d
+                JOIN {target} t ON t.id = d.target_id
+                GROUP BY t.author_id
+            )
+            UPDATE users u SET reputation = GREATEST(0, u.reputation - g.delta)
+            FROM granted g
+            WHERE u.id = g.author_id
+            """
+        )
+        op.create_unique_constraint(constraint, table, ['user_id', key])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _, _, constraint, _, _ in reversed(VOTE_TABLES):
+        op.drop_constraint(constraint, table, type_='unique')
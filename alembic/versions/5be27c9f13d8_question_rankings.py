@@ -0,0 +1,45 @@
+"""Precomputed trending and hot question rankings
+
+Revision ID: 5be27c9f13d8
+Revises: a81f4e6d2c05
+Create Date: 2026-10-18 11:26:03.170942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5be27c9f13d8'
+down_revision: Union[str, None] = 'a81f4e6d2c05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'question_rankings',
+        sa.Column('question_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_answer_at', sa.DateTime(), nullable=True),
+        sa.Column('views', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('answers', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('votes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('trending_score', sa.Float(), nullable=False),
+        sa.Column('hot_score', sa.Float(), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('question_id'),
+    )
+    op.create_index('idx_question_rankings_trending', 'question_rankings', ['trending_score'], unique=False)
+    op.create_index('idx_question_rankings_hot', 'question_rankings', ['hot_score'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_question_rankings_hot', table_name='question_rankings')
+    op.drop_index('idx_question_rankings_trending', table_name='question_rankings')
+    op.drop_table('question_rankings')
@@ -0,0 +1,61 @@
+"""Composite primary key on user_badges and badge stat indexes
+
+Revision ID: 6a1c8e24f0d3
+Revises: 0b6e93d2c4a5
+Create Date: 2026-10-18 16:31:12.058874
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1c8e24f0d3'
+down_revision: Union[str, None] = '0b6e93d2c4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Drop duplicate and dangling awards so the key can be created
+    op.execute(
+        """
+        DELETE FROM user_badges a
+        USING user_badges b
+        WHERE a.ctid < b.ctid
+          AND a.user_id = b.user_id
+          AND a.badge_id = b.badge_id
+        """
+    )
+    op.execute("DELETE FROM user_badges WHERE user_id IS NULL OR badge_id IS NULL")
+    op.alter_column('user_badges', 'user_id', nullable=False)
+    op.alter_column('user_badges', 'badge_id', nullable=False)
+    op.create_primary_key('user_badges_pkey', 'user_badges', ['user_id', 'badge_id'])
+
+    # Per-author lookups behind the badge stats, built without blocking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_answers_author',
+            'answers',
+            ['author_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_answer_votes_answer',
+            'answer_votes',
+            ['answer_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_answer_votes_answer', table_name='answer_votes')
+    op.drop_index('idx_answers_author', table_name='answers')
+    op.drop_constraint('user_badges_pkey', 'user_badges', type_='primary')
+    op.alter_column('user_badges', 'badge_id', nullable=True)
+    op.alter_column('user_badges', 'user_id', nullable=True)
@@ -0,0 +1,42 @@
+"""Maintained unread notification counters
+
+Revision ID: 8c4d9e1b3f72
+Revises: 1f6c2a8e4d57
+Create Date: 2026-10-18 20:05:26.735018
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4d9e1b3f72'
+down_revision: Union[str, None] = '1f6c2a8e4d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_counters',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('unread', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.execute(
+        """
+        INSERT INTO notification_counters (user_id, unread)
+        SELECT user_id, COUNT(*) FROM notifications
+        WHERE is_read = false
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('notification_counters')
@@ -0,0 +1,37 @@
+"""Durable queue of pending badge evaluations
+
+Revision ID: 9d2f4b7a1e36
+Revises: 6a1c8e24f0d3
+Create Date: 2026-10-18 17:02:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2f4b7a1e36'
+down_revision: Union[str, None] = '6a1c8e24f0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'badge_jobs',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('run_after', sa.DateTime(), nullable=False),
+        sa.Column('enqueued_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_index('idx_badge_jobs_run_after', 'badge_jobs', ['run_after'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_badge_jobs_run_after', table_name='badge_jobs')
+    op.drop_table('badge_jobs')
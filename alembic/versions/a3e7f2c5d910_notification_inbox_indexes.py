@@ -0,0 +1,45 @@
+"""Keyset pagination indexes for the notification inbox
+
+Revision ID: a3e7f2c5d910
+Revises: 8c4d9e1b3f72
+Create Date: 2026-10-18 20:41:09.518263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e7f2c5d910'
+down_revision: Union[str, None] = '8c4d9e1b3f72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so notifications can still be delivered while they build
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_notifications_user_created_at_id',
+            'notifications',
+            ['user_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_notifications_user_unread_created_at_id',
+            'notifications',
+            ['user_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text('is_read = false'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_notifications_user_unread_created_at_id', table_name='notifications')
+    op.drop_index('idx_notifications_user_created_at_id', table_name='notifications')
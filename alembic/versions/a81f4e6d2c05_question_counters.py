@@ -0,0 +1,44 @@
+"""Maintained question counters per category, tag and author
+
+Revision ID: a81f4e6d2c05
+Revises: 3c9d51a0be47
+Create Date: 2026-10-18 10:02:17.884105
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a81f4e6d2c05'
+down_revision: Union[str, None] = '3c9d51a0be47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'question_counters',
+        sa.Column('scope', sa.String(length=20), nullable=False),
+        sa.Column('scope_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('scope', 'scope_id'),
+    )
+    op.execute(
+        """
+        INSERT INTO question_counters (scope, scope_id, count)
+        SELECT 'category', category_id, COUNT(*) FROM questions GROUP BY category_id
+        UNION ALL
+        SELECT 'author', author_id, COUNT(*) FROM questions GROUP BY author_id
+        UNION ALL
+        SELECT 'tag', tag_id, COUNT(*) FROM question_tags WHERE tag_id IS NOT NULL GROUP BY tag_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('question_counters')
@@ -0,0 +1,79 @@
+"""Maintained up/down vote tallies on questions and answers
+
+Revision ID: b7c3e5a9d142
+Revises: 4e8b1c9f7a20
+Create Date: 2026-10-18 18:20:37.441926
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c3e5a9d142'
+down_revision: Union[str, None] = '4e8b1c9f7a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+TALLY_TARGETS = [
+    ('answers', 'answer_votes', 'answer_id'),
+    ('questions', 'question_votes', 'question_id'),
+]
+
+# Recounts the tallies of one batch of targets in id order and returns the
+# batch's last id, NULL once every row has been visited. The per-target
+# counts use idx_question_votes_question and idx_answer_votes_answer.
+TALLY_SQL = """
+    WITH batch AS (
+        SELECT id FROM {target}
+        WHERE id > :after
+        ORDER BY id
+        LIMIT :batch_size
+    ),
+    updated AS (
+        UPDATE {target} t SET
+            upvotes = v.upvotes,
+            downvotes = v.downvotes
+        FROM batch b
+        CROSS JOIN LATERAL (
+            SELECT
+                COUNT(*) FILTER (WHERE vote_value = 'up') AS upvotes,
+                COUNT(*) FILTER (WHERE vote_value = 'down') AS downvotes
+            FROM {votes} WHERE {key} = b.id
+        ) v
+        WHERE t.id = b.id
+          AND (t.upvotes, t.downvotes) IS DISTINCT FROM (v.upvotes, v.downvotes)
+    )
+    SELECT id FROM batch ORDER BY id DESC LIMIT 1
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The answer columns from 7e30f12eb912 had no default, so inserts that
+    # didn't set them failed
+    op.alter_column('answers', 'upvotes', server_default='0')
+    op.alter_column('answers', 'downvotes', server_default='0')
+    op.add_column('questions', sa.Column('upvotes', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('questions', sa.Column('downvotes', sa.Integer(), nullable=False, server_default='0'))
+
+    # Committed per batch so answers and questions stay writable; votes cast
+    # behind the cursor while it runs are left to the reconcile job
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for target, votes, key in TALLY_TARGETS:
+            statement = sa.text(TALLY_SQL.format(target=target, votes=votes, key=key))
+            after = '00000000-0000-0000-0000-000000000000'
+            while after is not None:
+                after = bind.execute(statement, {"after": after, "batch_size": BATCH_SIZE}).scalar()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('questions', 'downvotes')
+    op.drop_column('questions', 'upvotes')
+    op.alter_column('answers', 'downvotes', server_default=None)
+    op.alter_column('answers', 'upvotes', server_default=None)
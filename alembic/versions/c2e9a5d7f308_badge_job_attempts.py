@@ -0,0 +1,43 @@
+"""Retry counts and parking for badge jobs
+
+Revision ID: c2e9a5d7f308
+Revises: d6b2f8a4c153
+Create Date: 2026-10-18 22:04:31.622940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e9a5d7f308'
+down_revision: Union[str, None] = 'd6b2f8a4c153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('badge_jobs', sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('badge_jobs', sa.Column('last_error', sa.Text(), nullable=True))
+    op.add_column('badge_jobs', sa.Column('failed_at', sa.DateTime(), nullable=True))
+    # Parked jobs are never claimed, so the claim index leaves them out
+    op.drop_index('idx_badge_jobs_run_after', table_name='badge_jobs')
+    op.create_index(
+        'idx_badge_jobs_run_after',
+        'badge_jobs',
+        ['run_after'],
+        unique=False,
+        postgresql_where=sa.text('failed_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_badge_jobs_run_after', table_name='badge_jobs')
+    op.create_index('idx_badge_jobs_run_after', 'badge_jobs', ['run_after'], unique=False)
+    op.drop_column('badge_jobs', 'failed_at')
+    op.drop_column('badge_jobs', 'last_error')
+    op.drop_column('badge_jobs', 'attempts')
@@ -0,0 +1,113 @@
+"""Denormalized answer_count, score and last_activity_at on questions
+
+Revision ID: d4e0b8f6a719
+Revises: 5be27c9f13d8
+Create Date: 2026-10-18 12:40:51.306218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e0b8f6a719'
+down_revision: Union[str, None] = '5be27c9f13d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 5000
+
+# Backfills one batch of questions in id order and returns the batch's last
+# id, NULL once every question has been visited. The per-question subqueries
+# use the answers and question_votes indexes built just before.
+BACKFILL_SQL = sa.text("""
+    WITH batch AS (
+        SELECT id FROM questions
+        WHERE id > :after
+        ORDER BY id
+        LIMIT :batch_size
+    ),
+    updated AS (
+        UPDATE questions q SET
+            answer_count = a.answer_count,
+            score = v.score,
+            last_activity_at = GREATEST(q.created_at, a.last_answer_at)
+        FROM batch b
+        CROSS JOIN LATERAL (
+            SELECT COUNT(*) AS answer_count, MAX(created_at) AS last_answer_at
+            FROM answers WHERE question_id = b.id
+        ) a
+        CROSS JOIN LATERAL (
+            SELECT COALESCE(SUM(CASE WHEN vote_value = 'up' THEN 1 ELSE -1 END), 0) AS score
+            FROM question_votes WHERE question_id = b.id
+        ) v
+        WHERE q.id = b.id
+    )
+    SELECT id FROM batch ORDER BY id DESC LIMIT 1
+""")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('questions', sa.Column('answer_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('questions', sa.Column('score', sa.Integer(), nullable=False, server_default='0'))
+    # A constant default: existing rows are filled without rewriting the table
+    # and questions posted by the old code meanwhile still get a value
+    op.add_column(
+        'questions',
+        sa.Column(
+            'last_activity_at', sa.DateTime(), nullable=False, server_default=sa.text("timezone('utc', now())")
+        ),
+    )
+
+    # Indexes are built concurrently and the backfill commits per batch, so
+    # questions, answers and votes stay writable throughout
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_answers_question_created_at',
+            'answers',
+            ['question_id', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_question_votes_question',
+            'question_votes',
+            ['question_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+        bind = op.get_bind()
+        after = '00000000-0000-0000-0000-000000000000'
+        while after is not None:
+            after = bind.execute(BACKFILL_SQL, {"after": after, "batch_size": BATCH_SIZE}).scalar()
+
+        op.create_index(
+            'idx_questions_score_id',
+            'questions',
+            ['score', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_questions_last_activity_at_id',
+            'questions',
+            ['last_activity_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_questions_last_activity_at_id', table_name='questions')
+    op.drop_index('idx_questions_score_id', table_name='questions')
+    op.drop_index('idx_question_votes_question', table_name='question_votes')
+    op.drop_index('idx_answers_question_created_at', table_name='answers')
+    op.drop_column('questions', 'last_activity_at')
+    op.drop_column('questions', 'score')
+    op.drop_column('questions', 'answer_count')
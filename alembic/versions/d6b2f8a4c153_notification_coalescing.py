@@ -0,0 +1,73 @@
+"""Coalesce repeated notification events per target
+
+Revision ID: d6b2f8a4c153
+Revises: a3e7f2c5d910
+Create Date: 2026-10-18 21:12:47.306512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6b2f8a4c153'
+down_revision: Union[str, None] = 'a3e7f2c5d910'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 5000
+
+# Sets updated_at from created_at for one batch of notifications in id order
+# and returns the batch's last id, NULL once every row has been visited.
+# Rows already coalesced since the column was added keep their updated_at.
+BACKFILL_SQL = sa.text("""
+    WITH batch AS (
+        SELECT id FROM notifications
+        WHERE id > :after
+        ORDER BY id
+        LIMIT :batch_size
+    ),
+    updated AS (
+        UPDATE notifications n SET updated_at = n.created_at
+        FROM batch b
+        WHERE n.id = b.id AND n.event_count = 1 AND n.updated_at <> n.created_at
+    )
+    SELECT id FROM batch ORDER BY id DESC LIMIT 1
+""")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notification_outbox', sa.Column('target_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('notification_outbox', sa.Column('actor_id', postgresql.UUID(as_uuid=True), nullable=True))
+
+    # Constant defaults, so none of these rewrite the notifications table
+    op.add_column('notifications', sa.Column('target_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('notifications', sa.Column('event_count', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('notifications', sa.Column('last_actor_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column(
+        'notifications',
+        sa.Column(
+            'updated_at', sa.DateTime(), nullable=False, server_default=sa.text("timezone('utc', now())")
+        ),
+    )
+
+    # Committed per batch so notifications stay writable while it runs
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        after = '00000000-0000-0000-0000-000000000000'
+        while after is not None:
+            after = bind.execute(BACKFILL_SQL, {"after": after, "batch_size": BATCH_SIZE}).scalar()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('notifications', 'updated_at')
+    op.drop_column('notifications', 'last_actor_id')
+    op.drop_column('notifications', 'event_count')
+    op.drop_column('notifications', 'target_id')
+    op.drop_column('notification_outbox', 'actor_id')
+    op.drop_column('notification_outbox', 'target_id')
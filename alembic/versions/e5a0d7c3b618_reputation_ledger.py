@@ -0,0 +1,52 @@
+"""Reputation event ledger and daily roll-ups
+
+Revision ID: e5a0d7c3b618
+Revises: b7c3e5a9d142
+Create Date: 2026-10-18 18:57:14.902365
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a0d7c3b618'
+down_revision: Union[str, None] = 'b7c3e5a9d142'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'reputation_events',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('delta', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(length=30), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('rolled_up', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'idx_reputation_events_pending', 'reputation_events', ['id'],
+        unique=False, postgresql_where=sa.text('rolled_up = false'),
+    )
+    op.create_table(
+        'reputation_daily',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('delta', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'day'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('reputation_daily')
+    op.drop_index('idx_reputation_events_pending', table_name='reputation_events')
+    op.drop_table('reputation_events')
@@ -0,0 +1,89 @@
+"""Trigger-maintained weighted search vectors on questions and answers
+
+Revision ID: f27a6c3e9b14
+Revises: d4e0b8f6a719
+Create Date: 2026-10-18 13:55:32.640187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f27a6c3e9b14'
+down_revision: Union[str, None] = 'd4e0b8f6a719'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Shared by the triggers and backfill_search_vectors.py
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION question_search_vector(title text, body text)
+        RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+            SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+                || setweight(to_tsvector('english', coalesce(body, '')), 'B')
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION answer_search_vector(body text)
+        RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+            SELECT setweight(to_tsvector('english', coalesce(body, '')), 'B')
+        $$
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION questions_search_vector_trigger()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector := question_search_vector(NEW.title, NEW.body);
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER questions_search_vector_update
+        BEFORE INSERT OR UPDATE OF title, body ON questions
+        FOR EACH ROW EXECUTE FUNCTION questions_search_vector_trigger()
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION answers_search_vector_trigger()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector := answer_search_vector(NEW.body);
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER answers_search_vector_update
+        BEFORE INSERT OR UPDATE OF body ON answers
+        FOR EACH ROW EXECUTE FUNCTION answers_search_vector_trigger()
+        """
+    )
+    # Existing rows are filled by backfill_search_vectors.py in small batches,
+    # not here, so the migration never holds a table-wide lock.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS answers_search_vector_update ON answers")
+    op.execute("DROP FUNCTION IF EXISTS answers_search_vector_trigger()")
+    op.execute("DROP TRIGGER IF EXISTS questions_search_vector_update ON questions")
+    op.execute("DROP FUNCTION IF EXISTS questions_search_vector_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS answer_search_vector(text)")
+    op.execute("DROP FUNCTION IF EXISTS question_search_vector(text, text)")
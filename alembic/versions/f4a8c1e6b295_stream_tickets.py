@@ -0,0 +1,37 @@
+"""Single-use tickets for the notification stream
+
+Revision ID: f4a8c1e6b295
+Revises: c2e9a5d7f308
+Create Date: 2026-10-18 22:31:54.180467
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a8c1e6b295'
+down_revision: Union[str, None] = 'c2e9a5d7f308'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'stream_tickets',
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('token_hash'),
+    )
+    op.create_index('idx_stream_tickets_expires_at', 'stream_tickets', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_stream_tickets_expires_at', table_name='stream_tickets')
+    op.drop_table('stream_tickets')
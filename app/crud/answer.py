@@ -2,8 +2,12 @@ from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.schemas.answer import AnswerCreate
-from app.models import Answer, Question, AnswerVote, VoteValue
+from app.models import Answer, Question, VoteValue
 from app.crud.notification import notify_new_answer
+from app.crud.loaders import loader_options
+from app.crud.vote import cast_vote
+from app.crud.question import adjust_question_activity
+from app.services.badge_queue import enqueue_badge_check
 
 def create_answer(db: Session, answer_data: AnswerCreate, user_id: UUID):
     # Ensure the question exists
@@ -18,119 +22,72 @@ def create_answer(db: Session, answer_data: AnswerCreate, user_id: UUID):
         author_id=user_id,
     )
     db.add(answer)
-    db.commit()
-    db.refresh(answer)
-    
-    # Create a notification for the question author
+    db.flush()  # Assigns answer.id for the notification link
+    adjust_question_activity(db, question.id, answer_count=1, touch=True)
+    enqueue_badge_check(db, user_id)
+
+    # Notify the question author, in the same transaction
     if question.author_id != user_id:  # Don't notify if answering own question
         notify_new_answer(
             db, 
             question.author_id, 
             question.id, 
             question.title, 
-            answer.id
+            answer.id,
+            user_id,
         )
-    
-    return answer
 
+    db.commit()
+    db.refresh(answer)
+    return answer
 
-def get_answer_by_id(db: Session, answer_id: UUID):
-    # Retrieve an answer by ID and include vote details
-    answer = db.query(Answer).filter(Answer.id == answer_id).first()
-
-    if answer:
-        # Get upvotes and downvotes for the answer using the Vote model
-        upvotes = (
-            db.query(AnswerVote)
-            .filter(AnswerVote.answer_id == answer_id, AnswerVote.vote_value == VoteValue.up)
-            .count()
-        )
-        downvotes = (
-            db.query(AnswerVote)
-            .filter(AnswerVote.answer_id == answer_id, AnswerVote.vote_value == VoteValue.down)
-            .count()
-        )
 
-        # Include the vote counts in the answer object
-        answer.upvotes = upvotes
-        answer.downvotes = downvotes
+def get_answer_by_id(db: Session, answer_id: UUID, profile: str = None):
+    # Retrieve an answer by ID; its vote tallies are maintained on the row
+    return db.query(Answer).options(*loader_options(profile)).filter(Answer.id == answer_id).first()
 
-        return answer
-    return None
 
-
-def get_answers_by_question(db: Session, question_id: UUID):
+def get_answers_by_question(db: Session, question_id: UUID, profile: str = None):
     # Retrieve all answers for a given question
-    return db.query(Answer).filter(Answer.question_id == question_id).all()
+    return db.query(Answer).options(*loader_options(profile)).filter(Answer.question_id == question_id).all()
 
 
-def get_answers_by_user(db: Session, user_id: UUID):
+def get_answers_by_user(db: Session, user_id: UUID, profile: str = None):
     # Retrieve all answers by a specific user
-    return db.query(Answer).filter(Answer.author_id == user_id).all()
+    return db.query(Answer).options(*loader_options(profile)).filter(Answer.author_id == user_id).all()
 
 
 def upvote_answer(db: Session, answer_id: UUID, user_id: UUID):
-    # Check if the user has already voted on this answer
-    existing_vote = (
-        db.query(AnswerVote)
-        .filter(AnswerVote.answer_id == answer_id, AnswerVote.user_id == user_id)
-        .first()
-    )
-
-    if existing_vote:
-        if existing_vote.vote_value == VoteValue.up:
-            return {"message": "You have already upvoted this answer"}
-        elif existing_vote.vote_value == VoteValue.down:
-            # Change downvote to upvote
-            existing_vote.vote_value = VoteValue.up
-            db.commit()
-            return {"message": "Downvote changed to upvote"}
-
-    # Create a new upvote entry if no existing vote
-    vote = AnswerVote(answer_id=answer_id, user_id=user_id, vote_value=VoteValue.up)
-    db.add(vote)
+    outcome = cast_vote(db, "answer", answer_id, user_id, VoteValue.up)
     db.commit()
-    db.refresh(vote)
 
+    if outcome is None:
+        return {"message": "Answer not found"}
+    if outcome == "unchanged":
+        return {"message": "You have already upvoted this answer"}
+    if outcome == "changed":
+        return {"message": "Downvote changed to upvote"}
     return {"message": "Upvoted successfully"}
 
 
 def downvote_answer(db: Session, answer_id: UUID, user_id: UUID):
-    existing_vote = (
-        db.query(AnswerVote)
-        .filter(AnswerVote.answer_id == answer_id, AnswerVote.user_id == user_id)
-        .first()
-    )
-
-    if existing_vote:
-        if existing_vote.vote_value == VoteValue.down:
-            return {"message": "You have already downvoted this answer"}
-        elif existing_vote.vote_value == VoteValue.up:
-            # Change upvote to downvote
-            existing_vote.vote_value = VoteValue.down
-            db.commit()
-            return {"message": "Upvote changed to downvote"}
-
-    vote = AnswerVote(answer_id=answer_id, user_id=user_id, vote_value=VoteValue.down)
-    db.add(vote)
+    outcome = cast_vote(db, "answer", answer_id, user_id, VoteValue.down)
     db.commit()
-    db.refresh(vote)
 
+    if outcome is None:
+        return {"message": "Answer not found"}
+    if outcome == "unchanged":
+        return {"message": "You have already downvoted this answer"}
+    if outcome == "changed":
+        return {"message": "Upvote changed to downvote"}
     return {"message": "Downvoted successfully"}
 
 
 def get_votes_for_answer(db: Session, answer_id: UUID):
-    upvotes = (
-        db.query(AnswerVote)
-        .filter(AnswerVote.answer_id == answer_id, AnswerVote.vote_value == VoteValue.up)
-        .count()
-    )
-    downvotes = (
-        db.query(AnswerVote)
-        .filter(AnswerVote.answer_id == answer_id, AnswerVote.vote_value == VoteValue.down)
-        .count()
-    )
-    return {"upvotes": upvotes, "downvotes": downvotes}
+    row = db.query(Answer.upvotes, Answer.downvotes).filter(Answer.id == answer_id).first()
+    if row is None:
+        return {"upvotes": 0, "downvotes": 0}
+    return {"upvotes": row.upvotes, "downvotes": row.downvotes}
 
 
 def update_answer(db: Session, answer_id: UUID, answer_data: AnswerCreate):
@@ -148,6 +105,7 @@ def delete_answer(db: Session, answer_id: UUID):
     # Delete an answer
     answer = db.query(Answer).filter(Answer.id == answer_id).first()
     if answer:
+        adjust_question_activity(db, answer.question_id, answer_count=-1)
         db.delete(answer)
         db.commit()
         return True
@@ -161,11 +119,13 @@ def update_answer_helpful(db: Session, answer: Answer, is_helpful: bool):
     
     # Update the answer
     answer.is_helpful = is_helpful
-    db.commit()
-    db.refresh(answer)
-    
-    # If marked as helpful, create a notification for the answer author
+    if is_helpful:
+        enqueue_badge_check(db, answer.author_id)
+
+    # If marked as helpful, notify the answer author in the same transaction
     if is_helpful and question and answer.author_id != question.author_id:
         notify_answer_accepted(db, answer.author_id, question.id, question.title)
-    
+
+    db.commit()
+    db.refresh(answer)
     return answer
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.models import Badge, BadgeCategory, BadgeLevel, User
+from app.services.badge_catalog import badge_catalog
 
 
 
@@ -30,6 +31,7 @@ def create_badge(
     )
     db.add(badge)
     db.commit()
+    badge_catalog.invalidate()
     db.refresh(badge)
     return badge
 
@@ -97,6 +99,7 @@ def update_badge(
         badge.level = level
 
     db.commit()
+    badge_catalog.invalidate()
     db.refresh(badge)
     return badge
 
@@ -112,6 +115,7 @@ def delete_badge(db: Session, badge_id: UUID) -> bool:
 
     db.delete(badge)
     db.commit()
+    badge_catalog.invalidate()
     return True
 
 
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models import Answer, Question, User
+
+# Named eager-loading profiles, one per response shape. Each loads everything the
+# schema serializes in a fixed number of queries, however many rows are on the page:
+# many-to-one relationships are joined into the main query, collections are
+# fetched with one SELECT ... WHERE id IN (...) per relationship.
+LOADER_PROFILES = {
+    # QuestionOut: author (+ badges), tags, category
+    "question_list": (
+        joinedload(Question.author).selectinload(User.badges),
+        joinedload(Question.category),
+        selectinload(Question.tags),
+    ),
+    # QuestionOutWithAnswers: QuestionOut plus answers with their author (+ badges) and votes
+    "question_detail": (
+        joinedload(Question.author).selectinload(User.badges),
+        joinedload(Question.category),
+        selectinload(Question.tags),
+        selectinload(Question.answers).options(
+            joinedload(Answer.author).selectinload(User.badges),
+            selectinload(Answer.votes),
+        ),
+    ),
+    # AnswerOut: author (+ badges) and votes
+    "answer": (
+        joinedload(Answer.author).selectinload(User.badges),
+        selectinload(Answer.votes),
+    ),
+}
+
+
+def loader_options(profile: Optional[str]) -> tuple:
+    """Loader options for a named profile; None means plain lazy loading."""
+    if profile is None:
+        return ()
+    return LOADER_PROFILES[profile]
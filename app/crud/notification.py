@@ -1,9 +1,23 @@
+from sqlalchemy import delete, func, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
+from types import SimpleNamespace
+from typing import Optional
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
+import hashlib
+import secrets
 
-from app.models import Notification, NotificationType, User
+from app.models import Notification, NotificationCounter, NotificationOutbox, NotificationType, StreamTicket, User
 from app.schemas.notification import NotificationCreate, NotificationOut
+from app.schemas.question import TotalMode
+from app.services.counts import estimate_query_rows
+from app.services.notification_stream import publish_unread_count
+from app.services.pagination import keyset_paginate
+from app.services.unread_counts import unread_counts
+
+# How long a stream ticket can wait before it is redeemed
+STREAM_TICKET_TTL = timedelta(seconds=30)
 
 def create_notification(db: Session, notification_data: NotificationCreate):
     """Create a new notification for a user"""
@@ -12,98 +26,191 @@ def create_notification(db: Session, notification_data: NotificationCreate):
         type=notification_data.type,
         message=notification_data.message,
         link=notification_data.link,
-        created_at=datetime.utcnow(),
     )
+    notification.created_at = notification.updated_at = datetime.utcnow()
     db.add(notification)
+    adjust_unread_count(db, notification_data.user_id, 1)
+    publish_unread_count(db, notification_data.user_id)
     db.commit()
+    unread_counts.invalidate(notification_data.user_id)
     db.refresh(notification)
     return notification
 
-def get_notifications_for_user(db: Session, user_id: UUID, skip: int = 0, limit: int = 20, unread_only: bool = False):
-    """Get notifications for a specific user with pagination"""
+def get_notifications_for_user(
+    db: Session,
+    user_id: UUID,
+    skip: int = 0,
+    limit: int = 20,
+    unread_only: bool = False,
+    cursor: str = None,
+    total: TotalMode = TotalMode.exact,
+):
+    """
+    Get notifications for a specific user, newest first, with keyset pagination.
+    Pass `next_cursor` back as `cursor` for the next page; `skip` is only honoured
+    without a cursor. The unread total comes from the maintained counter.
+    """
     query = db.query(Notification).filter(Notification.user_id == user_id)
     
     if unread_only:
         query = query.filter(Notification.is_read == False)
-    
-    total = query.count()
-    notifications = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
-    
+
+    notifications, next_cursor = keyset_paginate(
+        query, (Notification.created_at, Notification.id), cursor, skip, limit
+    )
+
+    if total == TotalMode.none:
+        count = None
+    elif unread_only:
+        count = unread_counts.get(db, user_id)
+    elif total == TotalMode.estimate:
+        count = estimate_query_rows(db, query)
+    else:
+        count = query.count()
+
     return {
-        "total": total,
-        "items": notifications
+        "total": count,
+        "items": notifications,
+        "next_cursor": next_cursor,
     }
 
-def mark_notification_as_read(db: Session, notification_id: UUID):
-    """Mark a specific notification as read"""
-    notification = db.query(Notification).filter(Notification.id == notification_id).first()
-    if notification:
-        notification.is_read = True
-        db.commit()
-        db.refresh(notification)
-        return notification
-    return None
+def adjust_unread_count(db: Session, user_id: UUID, delta: int):
+    """Apply a change to a user's maintained unread count, without committing"""
+    db.execute(
+        insert(NotificationCounter)
+        .values(user_id=user_id, unread=max(delta, 0))
+        .on_conflict_do_update(
+            index_elements=[NotificationCounter.user_id],
+            set_={"unread": func.greatest(NotificationCounter.unread + delta, 0)},
+        )
+    )
+
+def mark_notification_as_read(db: Session, notification_id: UUID, user_id: UUID):
+    """Mark one of a user's notifications as read"""
+    # Only the request that flips is_read decrements the counter
+    flipped = db.execute(
+        update(Notification)
+        .where(
+            Notification.id == notification_id,
+            Notification.user_id == user_id,
+            Notification.is_read == False,
+        )
+        .values(is_read=True)
+        .returning(Notification.id)
+    ).scalar()
+    if flipped:
+        adjust_unread_count(db, user_id, -1)
+        publish_unread_count(db, user_id)
+    db.commit()
+    if flipped:
+        unread_counts.invalidate(user_id)
+    return (
+        db.query(Notification)
+        .filter(Notification.id == notification_id, Notification.user_id == user_id)
+        .first()
+    )
 
 def mark_all_notifications_as_read(db: Session, user_id: UUID):
     """Mark all notifications for a user as read"""
-    db.query(Notification).filter(
+    marked = db.query(Notification).filter(
         Notification.user_id == user_id,
         Notification.is_read == False
-    ).update({"is_read": True})
+    ).update({"is_read": True}, synchronize_session=False)
+    if marked:
+        # Notifications delivered after the update stay unread and counted
+        adjust_unread_count(db, user_id, -marked)
+        publish_unread_count(db, user_id)
     db.commit()
+    unread_counts.invalidate(user_id)
     return {"message": "All notifications marked as read"}
 
-def delete_notification(db: Session, notification_id: UUID):
-    """Delete a specific notification"""
-    notification = db.query(Notification).filter(Notification.id == notification_id).first()
-    if notification:
-        db.delete(notification)
-        db.commit()
-        return True
-    return False
+def delete_notification(db: Session, notification_id: UUID, user_id: UUID):
+    """Delete one of a user's notifications"""
+    deleted = db.execute(
+        delete(Notification)
+        .where(Notification.id == notification_id, Notification.user_id == user_id)
+        .returning(Notification.is_read)
+    ).first()
+    if deleted is None:
+        return False
+    if not deleted.is_read:
+        adjust_unread_count(db, user_id, -1)
+        publish_unread_count(db, user_id)
+    db.commit()
+    unread_counts.invalidate(user_id)
+    return True
 
 def get_unread_notification_count(db: Session, user_id: UUID):
-    """Get the count of unread notifications for a user"""
-    return db.query(Notification).filter(
-        Notification.user_id == user_id,
-        Notification.is_read == False
-    ).count()
+    """Get the count of unread notifications for a user, from the maintained counter"""
+    return unread_counts.get(db, user_id)
 
-def notify_new_answer(db: Session, question_author_id: UUID, question_id: UUID, question_title: str, answer_id: UUID):
-    """Create a notification when a new answer is posted to a user's question"""
-    notification = Notification(
+def _ticket_hash(ticket: str) -> str:
+    return hashlib.sha256(ticket.encode()).hexdigest()
+
+def create_stream_ticket(db: Session, user_id: UUID) -> str:
+    """Issue a single-use ticket that opens `user_id`'s notification stream"""
+    now = datetime.utcnow()
+    ticket = secrets.token_urlsafe(32)
+    db.execute(delete(StreamTicket).where(StreamTicket.expires_at <= now))
+    db.add(StreamTicket(token_hash=_ticket_hash(ticket), user_id=user_id, expires_at=now + STREAM_TICKET_TTL))
+    db.commit()
+    return ticket
+
+def redeem_stream_ticket(db: Session, ticket: str) -> Optional[UUID]:
+    """Consume a stream ticket, returning its user id, or None if it is unknown, used or expired"""
+    # The DELETE makes redemption single-use across every worker process
+    user_id = db.execute(
+        delete(StreamTicket)
+        .where(StreamTicket.token_hash == _ticket_hash(ticket), StreamTicket.expires_at > datetime.utcnow())
+        .returning(StreamTicket.user_id)
+    ).scalar()
+    db.commit()
+    return user_id
+
+def queue_notifications(db: Session, notifications: list):
+    """
+    Write notifications to the outbox in the caller's transaction, in one
+    multi-row insert and without committing. The dispatcher delivers them
+    once the transaction commits.
+    """
+    if notifications:
+        now = datetime.utcnow()
+        db.execute(insert(NotificationOutbox).values([{"created_at": now, **n} for n in notifications]))
+
+
+def notify_new_answer(db: Session, question_author_id: UUID, question_id: UUID, question_title: str, answer_id: UUID, answerer_id: UUID = None):
+    """Queue a notification when a new answer is posted to a user's question"""
+    queue_notifications(db, [dict(
         user_id=question_author_id,
         type=NotificationType.answer_posted,
         message=f"Someone answered your question: '{question_title}'",
         link=f"/questions/{question_id}#answer-{answer_id}",
-        created_at=datetime.utcnow(),
-    )
-    db.add(notification)
-    db.commit()
-    return notification
+        target_id=question_id,
+        actor_id=answerer_id,
+    )])
 
 def notify_answer_accepted(db: Session, answer_author_id: UUID, question_id: UUID, question_title: str):
-    """Create a notification when a user's answer is accepted"""
-    notification = Notification(
+    """Queue a notification when a user's answer is accepted"""
+    queue_notifications(db, [dict(
         user_id=answer_author_id,
         type=NotificationType.answer_accepted,
         message=f"Your answer was accepted for the question: '{question_title}'",
         link=f"/questions/{question_id}",
-        created_at=datetime.utcnow(),
-    )
-    db.add(notification)
-    db.commit()
-    return notification
+        target_id=question_id,
+    )])
 
 def notify_badge_earned(db: Session, user_id: UUID, badge_name: str, badge_id: UUID):
-    """Create a notification when a user earns a badge"""
-    notification = Notification(
-        user_id=user_id,
-        type=NotificationType.badge_earned,
-        message=f"Congratulations! You earned the '{badge_name}' badge",
-        link=f"/badges/{badge_id}",
-        created_at=datetime.utcnow(),
-    )
-    db.add(notification)
-    db.commit()
-    return notification
+    """Queue a notification when a user earns a badge"""
+    notify_badges_earned(db, user_id, [SimpleNamespace(id=badge_id, name=badge_name)])
+
+def notify_badges_earned(db: Session, user_id: UUID, badges: list):
+    """Queue one badge notification per badge; a burst is coalesced into one unread row"""
+    queue_notifications(db, [
+        dict(
+            user_id=user_id,
+            type=NotificationType.badge_earned,
+            message=f"Congratulations! You earned the '{badge.name}' badge",
+            link=f"/badges/{badge.id}",
+        )
+        for badge in badges
+    ])
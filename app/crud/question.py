@@ -1,9 +1,18 @@
+from collections import Counter
+from datetime import datetime
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func, text
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import func
 
-from app.models import Question, Tag
-from app.schemas.question import QuestionCreate
+from app.models import Question, Tag, question_tags
+from app.schemas.question import QuestionCreate, TotalMode, QuestionSort, SearchMode
+from app.crud.loaders import loader_options
+from app.services.counts import count_questions, adjust_question_counters, question_scopes
+from app.services.pagination import keyset_paginate
+from app.services.rankings import rankings
+from app.services.search import search_full_text, search_trigram, TRIGRAM_THRESHOLD
+from app.services.view_counter import view_counter
 
 # Create a new question
 def create_question(db: Session, question_data: QuestionCreate, user_id: UUID):
@@ -21,42 +30,51 @@ def create_question(db: Session, question_data: QuestionCreate, user_id: UUID):
     question.tags = tags 
     
     db.add(question)
+    adjust_question_counters(db, Counter(question_scopes(question.category_id, question.author_id, [t.id for t in tags])))
     db.commit()
     db.refresh(question)
     return question
 
-def get_question_by_id(db: Session, question_id: UUID, increment_view=True):
-    question = db.query(Question).filter(Question.id == question_id).first()
-    
+def get_question_by_id(db: Session, question_id: UUID, increment_view=True, profile: str = None):
+    question = db.query(Question).options(*loader_options(profile)).filter(Question.id == question_id).first()
+
     if question and increment_view:
-        question.view_count += 1
-        db.commit()
-        
+        # Buffered and written back in bulk by the view counter; the read stays read-only
+        view_counter.record(question.id)
+        set_committed_value(question, "view_count", question.view_count + view_counter.pending_views(question.id))
+
     return question
 
-def get_all_questions(db: Session, skip: int = 0, limit: int = 10):
-    total = db.query(Question).count()
-    items = db.query(Question).order_by(Question.created_at.desc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": items}
+QUESTION_ORDERS = {
+    QuestionSort.newest: (Question.created_at, Question.id),
+    QuestionSort.votes: (Question.score, Question.id),
+    QuestionSort.activity: (Question.last_activity_at, Question.id),
+}
 
-def get_questions_by_category(db: Session, category_id: UUID, skip: int = 0, limit: int = 10):
+def get_all_questions(db: Session, skip: int = 0, limit: int = 10, cursor: str = None, total: TotalMode = TotalMode.exact, sort: QuestionSort = QuestionSort.newest, profile: str = None):
+    query = db.query(Question)
+    items, next_cursor = keyset_paginate(query.options(*loader_options(profile)), QUESTION_ORDERS[sort], cursor, skip, limit)
+    return {"total": count_questions(db, query, total), "items": items, "next_cursor": next_cursor}
+
+def get_questions_by_category(db: Session, category_id: UUID, skip: int = 0, limit: int = 10, cursor: str = None, total: TotalMode = TotalMode.exact, sort: QuestionSort = QuestionSort.newest, profile: str = None):
     
     query = db.query(Question).filter(Question.category_id == category_id)
-    total = query.count()
-    items = query.order_by(Question.created_at.desc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": items}
+    items, next_cursor = keyset_paginate(query.options(*loader_options(profile)), QUESTION_ORDERS[sort], cursor, skip, limit)
+    return {"total": count_questions(db, query, total, "category", category_id), "items": items, "next_cursor": next_cursor}
 
-def get_questions_by_tag(db: Session, tag_id: UUID, skip: int = 0, limit: int = 10):
-    query = db.query(Question).join(Question.tags).filter(Tag.id == tag_id)
-    total = query.count()
-    items = query.order_by(Question.created_at.desc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": items}
+def get_questions_by_tag(db: Session, tag_id: UUID, skip: int = 0, limit: int = 10, cursor: str = None, total: TotalMode = TotalMode.exact, sort: QuestionSort = QuestionSort.newest, profile: str = None):
+    query = (
+        db.query(Question)
+        .join(question_tags, question_tags.c.question_id == Question.id)
+        .filter(question_tags.c.tag_id == tag_id)
+    )
+    items, next_cursor = keyset_paginate(query.options(*loader_options(profile)), QUESTION_ORDERS[sort], cursor, skip, limit)
+    return {"total": count_questions(db, query, total, "tag", tag_id), "items": items, "next_cursor": next_cursor}
 
-def get_questions_by_user(db: Session, user_id: UUID, skip: int = 0, limit: int = 10):
+def get_questions_by_user(db: Session, user_id: UUID, skip: int = 0, limit: int = 10, cursor: str = None, total: TotalMode = TotalMode.exact, sort: QuestionSort = QuestionSort.newest, profile: str = None):
     query = db.query(Question).filter(Question.author_id == user_id)
-    total = query.count()
-    items = query.order_by(Question.created_at.desc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": items}
+    items, next_cursor = keyset_paginate(query.options(*loader_options(profile)), QUESTION_ORDERS[sort], cursor, skip, limit)
+    return {"total": count_questions(db, query, total, "author", user_id), "items": items, "next_cursor": next_cursor}
 
 def get_questions_by_title(db: Session, title: str, skip: int = 0, limit: int = 10):
     query = db.query(Question).filter(Question.title.contains(title))
@@ -67,15 +85,22 @@ def get_questions_by_title(db: Session, title: str, skip: int = 0, limit: int =
 def update_question(db: Session, question_id: UUID, question_data: QuestionCreate):
     question = db.query(Question).filter(Question.id == question_id).first()
     if question:
+        old_scopes = question_scopes(question.category_id, question.author_id, [t.id for t in question.tags])
+
         question.title = question_data.title
         question.body = question_data.body
         question.images = question_data.images
         question.category_id = question_data.category_id
+        question.last_activity_at = datetime.utcnow()
         
         if question_data.tags is not None:
             tags = db.query(Tag).filter(Tag.id.in_(question_data.tags)).all()
             question.tags = tags 
         
+        new_scopes = question_scopes(question.category_id, question.author_id, [t.id for t in question.tags])
+        deltas = Counter(new_scopes)
+        deltas.subtract(old_scopes)
+        adjust_question_counters(db, deltas)
         db.commit()
         db.refresh(question)
         return question
@@ -84,55 +109,36 @@ def update_question(db: Session, question_id: UUID, question_data: QuestionCreat
 def delete_question(db: Session, question_id: UUID):
     question = db.query(Question).filter(Question.id == question_id).first()
     if question:
+        deltas = Counter(question_scopes(question.category_id, question.author_id, [t.id for t in question.tags]))
+        adjust_question_counters(db, Counter({scope: -delta for scope, delta in deltas.items()}))
         db.delete(question)
         db.commit()
         return True
     return False
 
-def search_questions_pg_trgm(db: Session, query: str, limit: int = 20):
-    return db.query(Question).filter(
-        or_(
-            Question.title.ilike(f"%{query}%"),
-            Question.body.ilike(f"%{query}%")
-        )
-    ).limit(limit).all()
+def adjust_question_activity(db: Session, question_id: UUID, answer_count: int = 0, score: int = 0, touch: bool = False):
+    """
+    Apply deltas to a question's denormalized activity columns in the caller's transaction.
+    A single UPDATE, so concurrent answers and votes never lose increments.
+    """
+    values = {}
+    if answer_count:
+        values[Question.answer_count] = func.greatest(Question.answer_count + answer_count, 0)
+    if score:
+        values[Question.score] = Question.score + score
+    if touch:
+        values[Question.last_activity_at] = func.greatest(Question.last_activity_at, datetime.utcnow())
+    if values:
+        db.query(Question).filter(Question.id == question_id).update(values, synchronize_session=False)
 
-def search_questions_full_text(db: Session, query: str, limit: int = 20):
-    ts_query = ' & '.join(query.split())
-    
-    result = db.query(Question).filter(
-        Question.search_vector.op('@@')(func.to_tsquery('english', ts_query))
-    ).order_by(
-        func.ts_rank(Question.search_vector, func.to_tsquery('english', ts_query)).desc()
-    ).limit(limit).all()
-    
-    return result
+def search_questions_pg_trgm(db: Session, query: str, limit: int = 20, skip: int = 0, threshold: float = TRIGRAM_THRESHOLD, title_only: bool = False, profile: str = None):
+    return search_trigram(db, query, threshold=threshold, title_only=title_only, skip=skip, limit=limit, profile=profile)
+
+def search_questions_full_text(db: Session, query: str, limit: int = 20, skip: int = 0, mode: SearchMode = SearchMode.websearch, profile: str = None):
+    return search_full_text(db, query, mode=mode, skip=skip, limit=limit, profile=profile)
 
 def get_trending_questions(db: Session, limit: int = 10):
-    query = text("""
-        SELECT * FROM questions 
-        WHERE created_at > NOW() - INTERVAL '7 days'
-        ORDER BY view_count DESC
-        LIMIT :limit
-    """)
-    
-    result = db.execute(query, {"limit": limit})
-    questions = [dict(row) for row in result]
-    
-    return questions
+    return rankings.get_trending(db, limit)
 
 def get_hot_questions(db: Session, limit: int = 10):
-    query = text("""
-        SELECT q.*, COUNT(a.id) as answer_count
-        FROM questions q
-        JOIN answers a ON q.id = a.question_id
-        WHERE a.created_at > NOW() - INTERVAL '3 days'
-        GROUP BY q.id
-        ORDER BY answer_count DESC
-        LIMIT :limit
-    """)
-    
-    result = db.execute(query, {"limit": limit})
-    questions = [dict(row) for row in result]
-    
-    return questions
+    return rankings.get_hot(db, limit)
@@ -1,10 +1,10 @@
 from sqlalchemy.orm import Session
 from uuid import UUID
 from datetime import datetime
-from rapidfuzz import fuzz
 
 from app.models import Tag
 from app.schemas.tag import TagCreate, TagOut
+from app.services.tag_index import tag_index
 
 def create_tag(db: Session, tag_data: TagCreate) -> TagOut:
     # Create a new tag
@@ -16,6 +16,7 @@ def create_tag(db: Session, tag_data: TagCreate) -> TagOut:
     db.add(tag)
     db.commit()
     db.refresh(tag)
+    tag_index.invalidate()
 
     return TagOut(
         id=tag.id,
@@ -61,6 +62,7 @@ def update_tag(db: Session, tag_id: UUID, tag_data: TagCreate) -> TagOut:
 
         db.commit()
         db.refresh(tag)
+        tag_index.invalidate()
 
         return TagOut(
             id=tag.id,
@@ -77,13 +79,15 @@ def delete_tag(db: Session, tag_id: UUID) -> bool:
     if tag:
         db.delete(tag)
         db.commit()
+        tag_index.invalidate()
         return True
     return False
 
 def get_tags_fuzzy(db: Session, query: str):
-    tags = db.query(Tag).all()
-    matches = [
-        q for q in tags
-        if fuzz.partial_ratio(query.lower(), q.name.lower()) > 70
-    ]
-    return matches
+    # Served from the in-memory tag index; no query unless the cache is cold
+    return tag_index.fuzzy(db, query)
+
+
+def autocomplete_tags(db: Session, prefix: str, limit: int = 10) -> list[TagOut]:
+    # Tags starting with the prefix, from the in-memory tag index
+    return tag_index.autocomplete(db, prefix, limit)
@@ -1,11 +1,12 @@
 from sqlalchemy.orm import Session
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
 from passlib.context import CryptContext
-from rapidfuzz import fuzz
 from sqlalchemy import func
-from app.models import User
+from sqlalchemy.orm import selectinload
+from app.models import ReputationDaily, User
 from app.schemas.user import UserCreate, UserOut, UserUpdate
+from app.services.user_index import user_index
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -42,6 +43,7 @@ def create_user(db: Session, user_data: UserCreate):
     db.add(user)
     db.commit()
     db.refresh(user)
+    user_index.upsert(user.id, user.username, user.display_name)
     return user
 
 
@@ -87,6 +89,7 @@ def update_user(db: Session, user_id: UUID, user_data: UserUpdate) -> UserOut:
 
         db.commit()
         db.refresh(user)
+        user_index.upsert(user.id, user.username, user.display_name)
 
         return user
     return None
@@ -107,25 +110,30 @@ def delete_user(db: Session, user_id: UUID) -> bool:
     if user:
         db.delete(user)
         db.commit()
+        user_index.remove(user_id)
         return True
     return False
 
 
 def get_users_fuzzy(db: Session, query: str, threshold: int = 70, limit: int = 20):
-    query_lower = query.lower()
-    all_users = db.query(User).limit(500).all()
-
-    fuzzy_matches = []
-    for user in all_users:
-        username = user.username or ""
-        display_name = user.display_name or ""
-
-        score = max(
-            fuzz.partial_ratio(query_lower, username.lower()),
-            fuzz.partial_ratio(query_lower, display_name.lower())
-        )
-        if score >= threshold:
-            fuzzy_matches.append((score, user))
-
-    fuzzy_matches.sort(reverse=True, key=lambda x: x[0])
-    return [user for _, user in fuzzy_matches[:limit]]
+    # Match against the in-memory name index, then load only the winners
+    user_index.ensure_loaded(db)
+    matches = user_index.search(query, threshold=threshold, limit=limit)
+    if not matches:
+        return []
+
+    ids = [user_id for user_id, _ in matches]
+    users = db.query(User).options(selectinload(User.badges)).filter(User.id.in_(ids)).all()
+    by_id = {user.id: user for user in users}
+    return [by_id[user_id] for user_id in ids if user_id in by_id]
+
+
+def get_reputation_history(db: Session, user_id: UUID, days: int = 30):
+    """A user's reputation change per UTC day over the last `days` days, oldest first."""
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    return (
+        db.query(ReputationDaily.day, ReputationDaily.delta)
+        .filter(ReputationDaily.user_id == user_id, ReputationDaily.day >= since)
+        .order_by(ReputationDaily.day)
+        .all()
+    )
@@ -0,0 +1,203 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models import VoteValue
+
+# Per vote target: vote table, target table and foreign key, the reputation
+# ledger source and the author's reputation change for each vote value, and
+# the SET clause applied to the target row `t` (`delta.weight` is the signed
+# change in net votes, `delta.up` / `delta.down` the changes in its tallies).
+VOTE_TARGETS = {
+    "question": dict(
+        votes="question_votes",
+        target="questions",
+        key="question_id",
+        source="question_vote",
+        reputation={VoteValue.up: 5, VoteValue.down: -1},
+        target_update=(
+            "score = t.score + delta.weight, upvotes = t.upvotes + delta.up, downvotes = t.downvotes + delta.down"
+        ),
+    ),
+    "answer": dict(
+        votes="answer_votes",
+        target="answers",
+        key="answer_id",
+        source="answer_vote",
+        reputation={VoteValue.up: 10, VoteValue.down: -2},
+        target_update="upvotes = t.upvotes + delta.up, downvotes = t.downvotes + delta.down",
+    ),
+}
+
+# The unique (user_id, target) constraint makes concurrent votes by one user
+# serialize on the conflicting row instead of inserting duplicates. Re-casting
+# the same vote updates nothing; changing it flips the value in place. A change
+# can only be to the other value, so the deltas follow from `inserted` alone.
+# Reputation goes to the ledger instead of the author's (hot) users row;
+# app.services.reputation applies it in batches.
+CAST_VOTE_SQL = """
+    WITH target AS (
+        SELECT id, author_id FROM {target} WHERE id = :target_id
+    ),
+    vote AS (
+        INSERT INTO {votes} (id, user_id, {key}, vote_value, created_at)
+        SELECT :vote_id, :user_id, target.id, CAST(:vote_value AS votevalue), :now
+        FROM target
+        ON CONFLICT (user_id, {key}) DO UPDATE SET vote_value = EXCLUDED.vote_value
+        WHERE {votes}.vote_value <> EXCLUDED.vote_value
+        RETURNING (xmax = 0) AS inserted
+    ),
+    delta AS (
+        SELECT
+            target.id AS target_id,
+            CASE WHEN vote.inserted THEN :value ELSE 2 * :value END AS weight,
+            CASE WHEN vote.inserted THEN :up_created ELSE :up_changed END AS up,
+            CASE WHEN vote.inserted THEN :down_created ELSE :down_changed END AS down,
+            CASE WHEN vote.inserted THEN :reputation ELSE :reputation - :previous_reputation END AS reputation
+        FROM vote, target
+    ),
+    adjusted AS (
+        UPDATE {target} t SET {target_update}
+        FROM delta
+        WHERE t.id = delta.target_id
+        RETURNING t.id
+    ),
+    rewarded AS (
+        INSERT INTO reputation_events (user_id, delta, source, created_at, rolled_up)
+        SELECT target.author_id, delta.reputation, :source, :now, false
+        FROM delta, target
+        WHERE delta.reputation <> 0
+        RETURNING id
+    )
+    SELECT
+        EXISTS (SELECT 1 FROM target) AS found,
+        (SELECT inserted FROM vote) AS inserted
+"""
+
+# Deletes a vote and reverses what casting it did
+RETRACT_VOTE_SQL = """
+    WITH vote AS (
+        DELETE FROM {votes} WHERE id = :vote_id
+        RETURNING {key} AS target_id, vote_value
+    ),
+    delta AS (
+        SELECT
+            vote.target_id,
+            CASE WHEN vote.vote_value = 'up' THEN -1 ELSE 1 END AS weight,
+            CASE WHEN vote.vote_value = 'up' THEN -1 ELSE 0 END AS up,
+            CASE WHEN vote.vote_value = 'down' THEN -1 ELSE 0 END AS down,
+            CASE WHEN vote.vote_value = 'up' THEN :undo_up ELSE :undo_down END AS reputation
+        FROM vote
+    ),
+    adjusted AS (
+        UPDATE {target} t SET {target_update}
+        FROM delta
+        WHERE t.id = delta.target_id
+        RETURNING t.id
+    ),
+    rewarded AS (
+        INSERT INTO reputation_events (user_id, delta, source, created_at, rolled_up)
+        SELECT t.author_id, delta.reputation, :source, :now, false
+        FROM delta
+        JOIN {target} t ON t.id = delta.target_id
+        RETURNING id
+    )
+    SELECT COUNT(*) AS deleted FROM vote
+"""
+
+# Served by the unique (user_id, target) indexes
+USER_VOTES_SQL = text("""
+    SELECT 'question' AS kind, question_id AS target_id, vote_value
+    FROM question_votes
+    WHERE user_id = :user_id AND question_id = ANY(CAST(:question_ids AS uuid[]))
+    UNION ALL
+    SELECT 'answer', answer_id, vote_value
+    FROM answer_votes
+    WHERE user_id = :user_id AND answer_id = ANY(CAST(:answer_ids AS uuid[]))
+""")
+
+
+def _format(sql: str, spec: dict) -> str:
+    return sql.format(
+        target=spec["target"], votes=spec["votes"], key=spec["key"], target_update=spec["target_update"]
+    )
+
+
+def cast_vote(db: Session, kind: str, target_id: UUID, user_id: UUID, value: VoteValue) -> Optional[str]:
+    """
+    Insert or change `user_id`'s vote on a question or answer in one statement,
+    adjusting the target's score and tallies and recording the author's
+    reputation change in the ledger, without committing.
+
+    Returns "created", "changed" or "unchanged", or None if the target doesn't exist.
+    """
+    spec = VOTE_TARGETS[kind]
+    previous = VoteValue.down if value == VoteValue.up else VoteValue.up
+    row = db.execute(
+        text(_format(CAST_VOTE_SQL, spec)),
+        {
+            "target_id": target_id,
+            "user_id": user_id,
+            "vote_id": uuid.uuid4(),
+            "vote_value": value.name,
+            "value": value.value,
+            "up_created": int(value == VoteValue.up),
+            "down_created": int(value == VoteValue.down),
+            "up_changed": value.value,
+            "down_changed": -value.value,
+            "reputation": spec["reputation"][value],
+            "previous_reputation": spec["reputation"][previous],
+            "source": spec["source"],
+            "now": datetime.utcnow(),
+        },
+    ).one()
+    if not row.found:
+        return None
+    if row.inserted is None:
+        return "unchanged"
+    return "created" if row.inserted else "changed"
+
+
+def retract_vote(db: Session, kind: str, vote_id: UUID) -> bool:
+    """Delete a vote and reverse its effect on the target and author's reputation, without committing."""
+    spec = VOTE_TARGETS[kind]
+    row = db.execute(
+        text(_format(RETRACT_VOTE_SQL, spec)),
+        {
+            "vote_id": vote_id,
+            "source": spec["source"],
+            "now": datetime.utcnow(),
+            "undo_up": -spec["reputation"][VoteValue.up],
+            "undo_down": -spec["reputation"][VoteValue.down],
+        },
+    ).one()
+    return row.deleted > 0
+
+
+def vote_message(outcome: Optional[str], kind: str, value: VoteValue) -> dict:
+    """The response body for a cast_vote outcome."""
+    if outcome is None:
+        return {"message": f"{kind.capitalize()} not found"}
+    if outcome == "unchanged":
+        return {"message": f"You have already {value.name}voted this {kind}"}
+    if outcome == "changed":
+        return {"message": f"Vote changed to {value.name}vote"}
+    return {"message": f"{value.name.capitalize()}voted successfully"}
+
+
+def get_user_votes(db: Session, user_id: UUID, question_ids: List[UUID], answer_ids: List[UUID]) -> dict:
+    """`user_id`'s votes on the given questions and answers, from one query."""
+    votes = {"questions": {}, "answers": {}}
+    if not question_ids and not answer_ids:
+        return votes
+    rows = db.execute(
+        USER_VOTES_SQL,
+        {"user_id": user_id, "question_ids": list(question_ids), "answer_ids": list(answer_ids)},
+    )
+    for row in rows:
+        votes[f"{row.kind}s"][row.target_id] = row.vote_value
+    return votes
@@ -28,13 +28,8 @@ async def get_jwks():
             _cached_keys = response.json()
     return _cached_keys
 
-# Get the current user from the token
-async def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
-
-    token = auth_header.split(" ")[1]
+# Verify a token and return the user id it was issued for
+async def verify_token(token: str) -> str:
     jwks = await get_jwks()
 
     try:
@@ -53,6 +48,16 @@ async def get_current_user(request: Request, db: Session = Depends(get_db)) -> U
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
+    return user_id
+
+# Get the current user from the token
+async def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
+
+    token = auth_header.split(" ")[1]
+    user_id = await verify_token(token)
 
     user = crud_user.get_user_by_id(db, user_id)
     if not user:
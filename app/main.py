@@ -1,14 +1,13 @@
 from fastapi import FastAPI, APIRouter, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
 
 from app.routes import badges, answers, category, questions, tag, users, votes, notifications
-from app.dependencies import get_db
-from app.crud import question as crud_question, user as crud_users, tag as crud_tags
 from app.models import User
 from app.database import SessionLocal
 from app.health import router as health_router
+from app.schemas.search import SearchResults
 from app.middleware.rate_limiter import standard_limiter, search_limiter
+from app.services import background, badge_queue, notification_dispatcher, notification_stream, reconcile, reputation, search  # noqa: F401 (registers their workers)
 
 app = FastAPI(
     title="Q&A API",
@@ -42,6 +41,15 @@ async def add_process_time_header(request: Request, call_next):
     response.headers["X-Process-Time"] = str(process_time)
     return response
 
+@app.on_event("startup")
+def start_background_workers():
+    background.start_workers()
+
+# Flushes buffered writes (view counts, ...) before the process exits
+@app.on_event("shutdown")
+def stop_background_workers():
+    background.stop_workers()
+
 router = APIRouter()
 
 app.include_router(badges.router, prefix="/api/badges", tags=["Badges"])
@@ -54,12 +62,9 @@ app.include_router(votes.router, prefix="/api/votes", tags=["QuestionVote", "Ans
 app.include_router(notifications.router, prefix="/api/notifications", tags=["Notifications"])
 app.include_router(health_router, tags=["Health"])
 
-@router.get("/search", tags=["Search"], dependencies=[Depends(search_limiter)])
-def get_search(query: str, db: Session = Depends(get_db)):
-    questions = crud_question.search_questions_full_text(db, query)
-    users = crud_users.get_users_fuzzy(db, query)
-    tags = crud_tags.get_tags_fuzzy(db, query)
-    return {"questions": questions, "users": users, "tags": tags}
+@router.get("/search", tags=["Search"], response_model=SearchResults, dependencies=[Depends(search_limiter)])
+async def get_search(query: str):
+    return await search.unified_search(query)
 
 app.include_router(router)
 
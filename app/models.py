@@ -6,12 +6,17 @@ from sqlalchemy import (
     String,
     Text,
     Integer,
+    BigInteger,
+    Float,
     DateTime,
+    Date,
     Boolean,
     Enum,
     ForeignKey,
     Table,
     Index,
+    UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -27,8 +32,8 @@ class UserRole(enum.Enum):
 user_badges = Table(
     "user_badges",
     Base.metadata,
-    Column("user_id", UUID(as_uuid=True), ForeignKey("users.id")),
-    Column("badge_id", UUID(as_uuid=True), ForeignKey("badges.id")),
+    Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True),
+    Column("badge_id", UUID(as_uuid=True), ForeignKey("badges.id"), primary_key=True),
 )
 
 class BadgeCategory(enum.Enum):
@@ -126,6 +131,7 @@ question_tags = Table(
     Base.metadata,
     Column("question_id", UUID(as_uuid=True), ForeignKey("questions.id")),
     Column("tag_id", UUID(as_uuid=True), ForeignKey("tags.id")),
+    Index("idx_question_tags_tag_question", "tag_id", "question_id"),
 )
 
 
@@ -148,6 +154,14 @@ class Question(Base):
         nullable=False,
     )
     view_count = Column(Integer, default=0, nullable=False) 
+    # Denormalized activity, maintained by the answer/vote crud and repaired by app.services.reconcile
+    answer_count = Column(Integer, default=0, nullable=False)
+    score = Column(Integer, default=0, nullable=False)
+    upvotes = Column(Integer, default=0, nullable=False)
+    downvotes = Column(Integer, default=0, nullable=False)
+    last_activity_at = Column(
+        DateTime, default=datetime.utcnow, server_default=text("timezone('utc', now())"), nullable=False
+    )
     search_vector = Column(TSVECTOR)  
 
     author = relationship("User", back_populates="questions")
@@ -162,9 +176,94 @@ class Question(Base):
 
     __table_args__ = (
         Index('idx_question_search_vector', 'search_vector', postgresql_using='gin'),
+        # Keyset pagination: (created_at, id) orders every question listing
+        Index('idx_questions_created_at_id', 'created_at', 'id'),
+        Index('idx_questions_category_created_at_id', 'category_id', 'created_at', 'id'),
+        Index('idx_questions_author_created_at_id', 'author_id', 'created_at', 'id'),
+        Index('idx_questions_score_id', 'score', 'id'),
+        Index('idx_questions_last_activity_at_id', 'last_activity_at', 'id'),
+        # pg_trgm indexes for method=trigram search
+        Index('idx_questions_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+        Index('idx_questions_body_trgm', 'body', postgresql_using='gin', postgresql_ops={'body': 'gin_trgm_ops'}),
+    )
+
+
+class QuestionCounter(Base):
+    """Maintained question totals per category, tag or author (see app.services.counts)."""
+    __tablename__ = "question_counters"
+
+    scope = Column(String(20), primary_key=True)  # "category", "tag" or "author"
+    scope_id = Column(UUID(as_uuid=True), primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+
+
+class QuestionRanking(Base):
+    """Precomputed trending/hot scores, refreshed by app.services.rankings."""
+    __tablename__ = "question_rankings"
+
+    question_id = Column(
+        UUID(as_uuid=True), ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True
+    )
+    created_at = Column(DateTime, nullable=False)
+    last_answer_at = Column(DateTime, nullable=True)
+    views = Column(Integer, default=0, nullable=False)
+    answers = Column(Integer, default=0, nullable=False)
+    votes = Column(Integer, default=0, nullable=False)
+    trending_score = Column(Float, nullable=False)
+    hot_score = Column(Float, nullable=True)
+    refreshed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('idx_question_rankings_trending', 'trending_score'),
+        Index('idx_question_rankings_hot', 'hot_score'),
     )
 
 
+class BadgeJob(Base):
+    """A pending badge evaluation for one user, drained by app.services.badge_queue."""
+    __tablename__ = "badge_jobs"
+
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    run_after = Column(DateTime, nullable=False)
+    enqueued_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Failed evaluations so far; after MAX_ATTEMPTS the job is parked by
+    # setting failed_at and is no longer claimed
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    failed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index('idx_badge_jobs_run_after', 'run_after', postgresql_where=text('failed_at IS NULL')),
+    )
+
+
+class ReputationEvent(Base):
+    """One reputation change, applied to users.reputation by app.services.reputation."""
+    __tablename__ = "reputation_events"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    delta = Column(Integer, nullable=False)
+    source = Column(String(30), nullable=False)  # "question_vote" or "answer_vote"
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    rolled_up = Column(Boolean, default=False, nullable=False)
+
+    __table_args__ = (
+        Index('idx_reputation_events_pending', 'id', postgresql_where=text('rolled_up = false')),
+    )
+
+
+class ReputationDaily(Base):
+    """Rolled-up reputation change per user and UTC day."""
+    __tablename__ = "reputation_daily"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    delta = Column(Integer, default=0, nullable=False)
+
+
 class Answer(Base):
     __tablename__ = "answers"
 
@@ -173,6 +272,8 @@ class Answer(Base):
     body = Column(Text, nullable=False)
     author_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     is_helpful = Column(Boolean, default=False)
+    upvotes = Column(Integer, default=0, nullable=False)
+    downvotes = Column(Integer, default=0, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime,
@@ -190,6 +291,8 @@ class Answer(Base):
 
     __table_args__ = (
         Index('idx_answer_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('idx_answers_question_created_at', 'question_id', 'created_at'),
+        Index('idx_answers_author', 'author_id'),
     )
 
 
@@ -210,6 +313,11 @@ class QuestionVote(Base):
     user = relationship("User", back_populates="question_votes")
     question = relationship("Question", back_populates="votes")
 
+    __table_args__ = (
+        Index('idx_question_votes_question', 'question_id'),
+        UniqueConstraint('user_id', 'question_id', name='uq_question_votes_user_question'),
+    )
+
 
 class AnswerVote(Base):
     __tablename__ = "answer_votes"
@@ -223,6 +331,11 @@ class AnswerVote(Base):
     user = relationship("User", back_populates="answer_votes")
     answer = relationship("Answer", back_populates="votes")
 
+    __table_args__ = (
+        Index('idx_answer_votes_answer', 'answer_id'),
+        UniqueConstraint('user_id', 'answer_id', name='uq_answer_votes_user_answer'),
+    )
+
 
 class Tag(Base):
     __tablename__ = "tags"
@@ -279,6 +392,62 @@ class Notification(Base):
     link = Column(String(255), nullable=True) 
     is_read = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Repeated events on one target are coalesced into the unread row (see
+    # app.services.notification_dispatcher). The ids carry no foreign keys so a
+    # deleted question or actor never blocks delivery.
+    target_id = Column(UUID(as_uuid=True), nullable=True)
+    event_count = Column(Integer, default=1, nullable=False)
+    last_actor_id = Column(UUID(as_uuid=True), nullable=True)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, server_default=text("timezone('utc', now())"), nullable=False
+    )
     
     # relationships
     user = relationship("User", back_populates="notifications")
+
+    __table_args__ = (
+        # Keyset pagination of the inbox: (created_at, id) within one user
+        Index('idx_notifications_user_created_at_id', 'user_id', 'created_at', 'id'),
+        Index(
+            'idx_notifications_user_unread_created_at_id', 'user_id', 'created_at', 'id',
+            postgresql_where=text('is_read = false'),
+        ),
+    )
+
+
+class NotificationCounter(Base):
+    """Maintained unread notification count per user (see app.crud.notification)."""
+    __tablename__ = "notification_counters"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread = Column(Integer, default=0, nullable=False)
+
+
+class StreamTicket(Base):
+    """
+    A short-lived, single-use credential for opening the notification stream,
+    so the JWT never has to travel in a URL (see app.crud.notification).
+    """
+    __tablename__ = "stream_tickets"
+
+    token_hash = Column(String(64), primary_key=True)  # SHA-256 of the ticket, hex
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('idx_stream_tickets_expires_at', 'expires_at'),
+    )
+
+
+class NotificationOutbox(Base):
+    """A pending notification, written in its event's transaction (see app.services.notification_dispatcher)."""
+    __tablename__ = "notification_outbox"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    type = Column(Enum(NotificationType), nullable=False)
+    message = Column(Text, nullable=False)
+    link = Column(String(255), nullable=True)
+    target_id = Column(UUID(as_uuid=True), nullable=True)
+    actor_id = Column(UUID(as_uuid=True), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -18,7 +18,6 @@ from app.crud.answer import (
 from app.models import Answer, User
 from app.schemas.answer import AnswerCreate, AnswerOut
 from app.dependencies import get_db, get_current_user
-from app.services.badges import check_and_award_badges
 
 router = APIRouter()
 
@@ -30,18 +29,15 @@ def create_answer_handler(
 ):
     """Create a new answer to a question"""
     try:
-        new_answer = create_answer_crud(db, answer, current_user.id)
-        
-        check_and_award_badges(db, current_user)
-        
-        return new_answer
+        # Badges are evaluated by the badge queue once the answer is committed
+        return create_answer_crud(db, answer, current_user.id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @router.get("/{answer_id}", response_model=AnswerOut)
 def get_answer_handler(answer_id: UUID, db: Session = Depends(get_db)):
     """Get a specific answer by ID"""
-    answer = get_answer_by_id_crud(db, answer_id)
+    answer = get_answer_by_id_crud(db, answer_id, profile="answer")
     if not answer:
         raise HTTPException(status_code=404, detail="Answer not found")
     return answer
@@ -49,12 +45,12 @@ def get_answer_handler(answer_id: UUID, db: Session = Depends(get_db)):
 @router.get("/question/{question_id}", response_model=List[AnswerOut])
 def get_answers_by_question_handler(question_id: UUID, db: Session = Depends(get_db)):
     """Get all answers for a specific question"""
-    return get_answers_by_question(db, question_id)
+    return get_answers_by_question(db, question_id, profile="answer")
 
 @router.get("/user/{user_id}", response_model=List[AnswerOut])
 def get_answers_by_user_handler(user_id: UUID, db: Session = Depends(get_db)):
     """Get all answers by a specific user"""
-    return get_answers_by_user(db, user_id)
+    return get_answers_by_user(db, user_id, profile="answer")
 
 @router.post("/{answer_id}/upvote")
 def upvote_answer_handler(
@@ -134,11 +130,5 @@ def mark_answer_helpful_handler(
     if not question or str(question.author_id) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Only the question author can mark answers as helpful")
     
-    updated_answer = update_answer_helpful_crud(db, answer, is_helpful)
-    
-    # Check for badges for the answer author
-    answer_author = db.query(User).filter(User.id == answer.author_id).first()
-    if answer_author:
-        check_and_award_badges(db, answer_author)
-    
-    return updated_answer
+    # Also queues a badge evaluation for the answer author
+    return update_answer_helpful_crud(db, answer, is_helpful)
@@ -6,6 +6,7 @@ from uuid import UUID
 from app.crud import badge as crud
 from app.schemas import badge
 from app.database import get_db
+from app.services.badge_catalog import badge_catalog
 
 router = APIRouter()
 
@@ -18,7 +19,8 @@ def create_badge(badge: badge.BadgeCreate, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=list[badge.Badge])
 def get_all_badges(db: Session = Depends(get_db)):
-    return crud.get_all_badges(db)
+    # Served from the in-process catalog; the session is only used to (re)load it
+    return badge_catalog.get(db).badges
 
 @router.get("/{badge_id}", response_model=badge.Badge)
 def get_badge(badge_id: UUID, db: Session = Depends(get_db)):
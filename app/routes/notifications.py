@@ -1,28 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
+from typing import Annotated, Optional
 from uuid import UUID
 
 
-from app.dependencies import get_current_user
-from app.database import get_db
+from app.dependencies import get_current_user, verify_token
+from app.database import SessionLocal, get_db
 from app.crud import notification as crud_notification
-from app.schemas.notification import NotificationOut, NotificationCreate
+from app.schemas.notification import NotificationOut, NotificationCreate, PaginatedNotifications
+from app.schemas.question import TotalMode
 from app.models import User
+from app.crud import user as crud_user
+from app.services.notification_stream import broker, event_stream
 
 router = APIRouter()
 
-@router.get("/", response_model=dict)
+@router.get("/", response_model=PaginatedNotifications)
 async def get_notifications(
-    skip: int = 0,
-    limit: int = 20,
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(gt=0, le=100)] = 20,
     unread_only: bool = False,
+    cursor: Optional[str] = None,
+    total: TotalMode = TotalMode.exact,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get notifications for the current user"""
-    return crud_notification.get_notifications_for_user(
-        db, current_user.id, skip, limit, unread_only
-    )
+    try:
+        return crud_notification.get_notifications_for_user(
+            db, current_user.id, skip, limit, unread_only, cursor=cursor, total=total
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/count", response_model=dict)
 async def get_unread_count(
@@ -33,6 +45,77 @@ async def get_unread_count(
     count = crud_notification.get_unread_notification_count(db, current_user.id)
     return {"count": count}
 
+def _load_unread_count(user_id: UUID) -> Optional[int]:
+    db = SessionLocal()
+    try:
+        if not crud_user.get_user_by_id(db, user_id):
+            return None
+        return crud_notification.get_unread_notification_count(db, user_id)
+    finally:
+        db.close()
+
+@router.post("/stream/ticket", response_model=dict)
+async def create_stream_ticket(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Issue a single-use ticket for GET /stream?ticket=..., valid for a few
+    seconds. EventSource can't send an Authorization header, and a JWT in the
+    query string would end up in access logs.
+    """
+    ticket = crud_notification.create_stream_ticket(db, current_user.id)
+    return {"ticket": ticket, "expires_in": int(crud_notification.STREAM_TICKET_TTL.total_seconds())}
+
+def _redeem_stream_ticket(ticket: str) -> Optional[UUID]:
+    db = SessionLocal()
+    try:
+        return crud_notification.redeem_stream_ticket(db, ticket)
+    finally:
+        db.close()
+
+@router.get("/stream")
+async def stream_notifications(request: Request, ticket: Optional[str] = None):
+    """
+    Push new notifications and unread count changes as Server-Sent Events.
+    Authenticate with the Authorization header, or from a browser with a
+    ticket from POST /stream/ticket.
+    """
+    auth_header = request.headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        try:
+            user_id = UUID(await verify_token(auth_header.split(" ")[1]))
+        except ValueError:
+            raise HTTPException(status_code=401, detail="Invalid token payload")
+    elif ticket:
+        user_id = await run_in_threadpool(_redeem_stream_ticket, ticket)
+        if user_id is None:
+            raise HTTPException(status_code=401, detail="Invalid or expired stream ticket")
+    else:
+        raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
+
+    # Subscribed before the count is read, so changes published while it
+    # loads are queued rather than lost
+    queue = broker.subscribe(str(user_id))
+    try:
+        # Its own short-lived session: a get_db session would hold a pooled
+        # connection for as long as the stream stays open
+        unread = await run_in_threadpool(_load_unread_count, user_id)
+    except Exception:
+        broker.unsubscribe(str(user_id), queue)
+        raise
+    if unread is None:
+        broker.unsubscribe(str(user_id), queue)
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return StreamingResponse(
+        event_stream(str(user_id), queue, unread),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also covers a client that leaves before the stream starts
+        background=BackgroundTask(broker.unsubscribe, str(user_id), queue),
+    )
+
 @router.post("/{notification_id}/read", response_model=NotificationOut)
 async def mark_as_read(
     notification_id: UUID,
@@ -40,14 +123,11 @@ async def mark_as_read(
     current_user: User = Depends(get_current_user)
 ):
     """Mark a notification as read"""
-    notification = crud_notification.mark_notification_as_read(db, notification_id)
+    # Scoped to the current user, so other users' notifications are never touched
+    notification = crud_notification.mark_notification_as_read(db, notification_id, current_user.id)
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
     
-    # Ensure the notification belongs to the current user
-    if notification.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to access this notification")
-    
     return notification
 
 @router.post("/read-all", response_model=dict)
@@ -65,17 +145,7 @@ async def delete_notification(
     current_user: User = Depends(get_current_user)
 ):
     """Delete a notification"""
-    # First check if the notification exists and belongs to the current user
-    notification = db.query(crud_notification.Notification).filter(
-        crud_notification.Notification.id == notification_id,
-        crud_notification.Notification.user_id == current_user.id
-    ).first()
-    
-    if not notification:
+    # Scoped to the current user, so other users' notifications are never touched
+    if not crud_notification.delete_notification(db, notification_id, current_user.id):
         raise HTTPException(status_code=404, detail="Notification not found")
-    
-    success = crud_notification.delete_notification(db, notification_id)
-    if success:
-        return {"message": "Notification deleted successfully"}
-    
-    raise HTTPException(status_code=500, detail="Failed to delete notification")
+    return {"message": "Notification deleted successfully"}
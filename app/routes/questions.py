@@ -4,7 +4,7 @@ from uuid import UUID
 from typing import Optional, List, Annotated
 
 from app.crud import question as crud_question
-from app.schemas.question import QuestionOutWithAnswers, QuestionCreate, QuestionOut, PaginatedQuestions
+from app.schemas.question import QuestionOutWithAnswers, QuestionCreate, QuestionOut, PaginatedQuestions, TotalMode, QuestionSort, SearchMode
 from app.dependencies import get_db, get_current_user
 from app.middleware.rate_limiter import standard_limiter
 
@@ -21,9 +21,15 @@ def create_question_handler(question: QuestionCreate, db: Session = Depends(get_
 def get_questions(
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(gt=0, le=100)] = 10,
+    cursor: Optional[str] = None,
+    total: TotalMode = TotalMode.exact,
+    sort: QuestionSort = QuestionSort.newest,
     db: Session = Depends(get_db)
 ):
-    return crud_question.get_all_questions(db, skip=skip, limit=limit)
+    try:
+        return crud_question.get_all_questions(db, skip=skip, limit=limit, cursor=cursor, total=total, sort=sort, profile="question_list")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/trending", response_model=List[QuestionOut])
 def get_trending_questions(
@@ -46,7 +52,7 @@ def get_question_by_id(
     increment_view: bool = True,
     db: Session = Depends(get_db)
 ):
-    question = crud_question.get_question_by_id(db, question_id, increment_view=increment_view)
+    question = crud_question.get_question_by_id(db, question_id, increment_view=increment_view, profile="question_detail")
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
     return question
@@ -93,23 +99,39 @@ def get_questions_by_category_handler(
     category_id: UUID, 
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(gt=0, le=100)] = 10,
+    cursor: Optional[str] = None,
+    total: TotalMode = TotalMode.exact,
+    sort: QuestionSort = QuestionSort.newest,
     db: Session = Depends(get_db)
 ):
-    return crud_question.get_questions_by_category(db, category_id, skip=skip, limit=limit)
+    try:
+        return crud_question.get_questions_by_category(db, category_id, skip=skip, limit=limit, cursor=cursor, total=total, sort=sort, profile="question_list")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/tag/{tag_id}", response_model=PaginatedQuestions)
 def get_questions_by_tag_handler(
     tag_id: UUID, 
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(gt=0, le=100)] = 10,
+    cursor: Optional[str] = None,
+    total: TotalMode = TotalMode.exact,
+    sort: QuestionSort = QuestionSort.newest,
     db: Session = Depends(get_db)
 ):
-    return crud_question.get_questions_by_tag(db, tag_id, skip=skip, limit=limit)
+    try:
+        return crud_question.get_questions_by_tag(db, tag_id, skip=skip, limit=limit, cursor=cursor, total=total, sort=sort, profile="question_list")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/search/{query}", response_model=List[QuestionOut], dependencies=[Depends(standard_limiter)])
 def search_questions(
     query: str, 
     method: Optional[str] = "full-text",
+    mode: SearchMode = SearchMode.websearch,
+    threshold: Annotated[float, Query(ge=0, le=1)] = 0.3,
+    title_only: bool = False,
+    skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(gt=0, le=50)] = 20,
     db: Session = Depends(get_db)
 ):
@@ -117,17 +139,28 @@ def search_questions(
     Search questions using either full-text search or trigram similarity
     
     - method: 'full-text' (default) or 'trigram'
+    - mode: full-text query syntax, 'websearch' (default) or 'prefix' to match the last word as a prefix
+    - threshold: minimum trigram word similarity (trigram only)
+    - title_only: match titles only, skipping bodies (trigram only)
     """
     if method == "full-text":
-        return crud_question.search_questions_full_text(db, query, limit=limit)
+        return crud_question.search_questions_full_text(db, query, limit=limit, skip=skip, mode=mode, profile="question_list")
     else:
-        return crud_question.search_questions_pg_trgm(db, query, limit=limit)
+        return crud_question.search_questions_pg_trgm(
+            db, query, limit=limit, skip=skip, threshold=threshold, title_only=title_only, profile="question_list"
+        )
 
 @router.get("/user/{user_id}", response_model=PaginatedQuestions)
 def get_questions_by_user_handler(
     user_id: UUID, 
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(gt=0, le=100)] = 10,
+    cursor: Optional[str] = None,
+    total: TotalMode = TotalMode.exact,
+    sort: QuestionSort = QuestionSort.newest,
     db: Session = Depends(get_db)
 ):
-    return crud_question.get_questions_by_user(db, user_id, skip=skip, limit=limit)
+    try:
+        return crud_question.get_questions_by_user(db, user_id, skip=skip, limit=limit, cursor=cursor, total=total, sort=sort, profile="question_list")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
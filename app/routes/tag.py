@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import List
+from typing import List, Annotated
 
 from app.database import get_db
 from app.schemas.tag import TagCreate, TagOut
@@ -18,6 +18,15 @@ def create_tag(tag_data: TagCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/autocomplete", response_model=List[TagOut])
+def autocomplete_tags(
+    prefix: Annotated[str, Query(min_length=1, max_length=50)],
+    limit: Annotated[int, Query(gt=0, le=50)] = 10,
+    db: Session = Depends(get_db),
+):
+    return crud_tag.autocomplete_tags(db, prefix, limit)
+
+
 @router.get("/{tag_id}", response_model=TagOut)
 def get_tag_by_id(tag_id: UUID, db: Session = Depends(get_db)):
     tag = crud_tag.get_tag_by_id(db, tag_id)
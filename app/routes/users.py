@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import List
 
-from app.schemas.user import UserCreate, UserOut,UserUpdate
+from app.schemas.user import ReputationDay, UserCreate, UserOut,UserUpdate
 from app.crud import user as crud_user
 from app.database import get_db
 from app.dependencies import get_current_user
@@ -51,6 +51,16 @@ def get_user_by_id(user_id: UUID, db: Session = Depends(get_db)):
     return user
 
 
+@router.get("/{user_id}/reputation/history", response_model=List[ReputationDay])
+def get_reputation_history(
+    user_id: UUID,
+    days: int = Query(30, ge=1, le=366),
+    db: Session = Depends(get_db),
+):
+    # Served from the daily roll-up buckets; days without changes are omitted
+    return crud_user.get_reputation_history(db, user_id, days)
+
+
 @router.get("/username/{username}", response_model=UserOut)
 def get_user_by_username(username: str, db: Session = Depends(get_db)):
     user = crud_user.get_user_by_username(db, username)
@@ -20,6 +20,8 @@ class Answer(AnswerBase):
     id: UUID
     created_at: datetime
     updated_at: datetime
+    upvotes: int = 0
+    downvotes: int = 0
 
     class Config:
         from_attributes = True
@@ -8,6 +8,8 @@ class BadgeCategory(str, Enum):
     TECHNICAL = "technical"
     PARTICIPATION = "participation"
     QUALITY = "quality"
+    ACHIEVEMENT = "achievement"
+    MODERATION = "moderation"
 
 
 class BadgeLevel(str, Enum):
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from app.models import NotificationType
 
 class NotificationBase(BaseModel):
@@ -17,6 +17,15 @@ class NotificationOut(NotificationBase):
     id: UUID
     is_read: bool
     created_at: datetime
+    target_id: Optional[UUID] = None
+    event_count: int = 1  # Events coalesced into this notification
+    last_actor_id: Optional[UUID] = None
+    updated_at: Optional[datetime] = None  # Time of the latest event
 
     class Config:
         from_attributes = True
+
+class PaginatedNotifications(BaseModel):
+    total: Optional[int] = None  # None when requested with total=none
+    items: List[NotificationOut]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to fetch the next page
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from enum import Enum
 from uuid import UUID
 from datetime import datetime
 from typing import List, Optional
@@ -26,6 +27,11 @@ class Question(QuestionBase):
     created_at: datetime
     updated_at: datetime
     view_count: int = 0  # Added view_count field
+    answer_count: int = 0
+    score: int = 0
+    upvotes: int = 0
+    downvotes: int = 0
+    last_activity_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -38,9 +44,24 @@ class QuestionOut(Question):
     class Config:
         from_attributes = True
 
+class QuestionSort(str, Enum):
+    newest = "newest"
+    votes = "votes"
+    activity = "activity"
+
+class SearchMode(str, Enum):
+    websearch = "websearch"
+    prefix = "prefix"
+
+class TotalMode(str, Enum):
+    exact = "exact"
+    estimate = "estimate"
+    none = "none"
+
 class PaginatedQuestions(BaseModel):
-    total: int
+    total: Optional[int] = None  # None when requested with total=none
     items: List[QuestionOut]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to fetch the next page
 
 class QuestionOutWithAnswers(QuestionOut):
     answers: List[AnswerOut]
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import List
+from app.schemas.question import QuestionOut
+from app.schemas.tag import TagOut
+from app.schemas.user import UserOut
+
+class SearchResults(BaseModel):
+    questions: List[QuestionOut]
+    users: List[UserOut]
+    tags: List[TagOut]
+    partial: bool = False  # True when a source timed out or failed
+    timed_out: List[str] = []
+    failed: List[str] = []
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, constr, HttpUrl
 from uuid import UUID
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 
 
@@ -47,3 +47,11 @@ class UserOut(UserBase):
 
     class Config:
         from_attributes = True
+
+
+class ReputationDay(BaseModel):
+    day: date
+    delta: int
+
+    class Config:
+        from_attributes = True
@@ -1,7 +1,7 @@
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, validator
 from uuid import UUID
 from enum import Enum
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class VoteValue(str, Enum):
@@ -55,3 +55,14 @@ class VoteOut(BaseModel):
 
 class VoteOutList(BaseModel):
     votes: list[VoteOut]
+
+
+class VoteLookup(BaseModel):
+    question_ids: List[UUID] = Field(default_factory=list, max_length=200)
+    answer_ids: List[UUID] = Field(default_factory=list, max_length=200)
+
+
+class MyVotes(BaseModel):
+    # Only targets the user has voted on appear
+    questions: Dict[UUID, VoteValue]
+    answers: Dict[UUID, VoteValue]
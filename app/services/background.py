@@ -0,0 +1,74 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicWorker:
+    """
+    Runs `task` every `interval` seconds on a daemon thread.
+
+    `wake()` runs the task early (e.g. when a buffer fills up). With `run_on_stop`
+    the task runs one last time during shutdown, after the thread has exited.
+    """
+
+    def __init__(self, name: str, task, interval: float, run_on_stop: bool = False):
+        self.name = name
+        self.task = task
+        self.interval = interval
+        self.run_on_stop = run_on_stop
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self, timeout: float = 10):
+        self._stopping = True
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        if self.run_on_stop:
+            self._run_once()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stopping:
+                return
+            self._run_once()
+
+    def _run_once(self):
+        try:
+            self.task()
+        except Exception:
+            logger.exception("Background task %s failed", self.name)
+
+
+_workers = []
+
+
+def register(worker: PeriodicWorker) -> PeriodicWorker:
+    """Add a worker to the set started and stopped with the application."""
+    _workers.append(worker)
+    return worker
+
+
+def start_workers():
+    for worker in _workers:
+        worker.start()
+
+
+def stop_workers():
+    for worker in reversed(_workers):
+        worker.stop()
@@ -0,0 +1,94 @@
+import bisect
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models import Badge
+from app.schemas.badge import Badge as BadgeSchema
+
+# Upper bound on staleness for badges changed by other worker processes
+TTL = float(os.environ.get("BADGE_CATALOG_TTL", "300"))
+
+
+class CatalogSnapshot:
+    def __init__(self, badges: List[BadgeSchema], requirements: Dict[UUID, Tuple[str, float]]):
+        self.badges = badges
+        self.by_id = {badge.id: badge for badge in badges}
+        # stat -> ascending thresholds, and the badges in the same order
+        self.thresholds: Dict[str, List[float]] = {}
+        self.threshold_badges: Dict[str, List[BadgeSchema]] = {}
+        for badge_id, (stat, threshold) in sorted(requirements.items(), key=lambda item: item[1][1]):
+            self.thresholds.setdefault(stat, []).append(threshold)
+            self.threshold_badges.setdefault(stat, []).append(self.by_id[badge_id])
+        self.built_at = time.monotonic()
+
+    def eligible(self, stats: dict) -> List[BadgeSchema]:
+        """Every badge whose threshold the given stats meet."""
+        eligible = []
+        for stat, thresholds in self.thresholds.items():
+            value = stats.get(stat)
+            if value is not None:
+                eligible.extend(self.threshold_badges[stat][:bisect.bisect_right(thresholds, value)])
+        return eligible
+
+
+class BadgeCatalog:
+    """
+    The badge table, cached in memory and precompiled into per-stat threshold lists.
+
+    create_badge, update_badge and delete_badge invalidate it; the next access reloads.
+    """
+
+    def __init__(self, ttl: float = TTL):
+        self.ttl = ttl
+        self._snapshot: Optional[CatalogSnapshot] = None
+        # Bumped by invalidate(), as in TagIndex: a build that started under
+        # an older generation may have missed the change and is not kept
+        self._generation = 0
+        self._lock = threading.Lock()  # One build at a time
+        self._state_lock = threading.Lock()  # Guards _snapshot and _generation
+
+    def invalidate(self):
+        with self._state_lock:
+            self._generation += 1
+            self._snapshot = None
+
+    def get(self, db: Session) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.built_at < self.ttl:
+            return snapshot
+        with self._lock:
+            with self._state_lock:
+                snapshot, generation = self._snapshot, self._generation
+            if snapshot is None or time.monotonic() - snapshot.built_at >= self.ttl:
+                snapshot = self._build(db)
+                with self._state_lock:
+                    if self._generation == generation:
+                        self._snapshot = snapshot
+        return snapshot
+
+    def _build(self, db: Session) -> CatalogSnapshot:
+        # Imported here: app.services.badges imports this module
+        from app.services.badges import badge_requirement
+
+        badges, requirements = [], {}
+        for badge in db.query(Badge).order_by(Badge.name):
+            badges.append(BadgeSchema(
+                id=badge.id,
+                name=badge.name,
+                description=badge.description,
+                criteria=badge.criteria or {},
+                category=badge.category.value,
+                level=badge.level.value,
+            ))
+            requirement = badge_requirement(badge)
+            if requirement:
+                requirements[badge.id] = requirement
+        return CatalogSnapshot(badges, requirements)
+
+
+badge_catalog = BadgeCatalog()
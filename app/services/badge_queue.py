@@ -0,0 +1,102 @@
+import logging
+import os
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import BadgeJob
+from app.services.background import PeriodicWorker, register
+from app.services.badges import check_and_award_badges
+
+logger = logging.getLogger(__name__)
+
+DRAIN_INTERVAL = float(os.environ.get("BADGE_QUEUE_INTERVAL", "5"))
+# Activity within this window after the first enqueue shares one evaluation
+DEBOUNCE = timedelta(seconds=float(os.environ.get("BADGE_JOB_DELAY", "10")))
+# A failing job is retried after RETRY_DELAY, doubling each time, and parked
+# after MAX_ATTEMPTS failures so one bad user can't churn the queue
+RETRY_DELAY = timedelta(minutes=5)
+MAX_ATTEMPTS = 5
+
+# Claims one due job. The row stays locked, and the claim uncommitted, until
+# the evaluation commits, so a crash leaves the job in place.
+CLAIM_SQL = text("""
+    DELETE FROM badge_jobs
+    WHERE user_id = (
+        SELECT user_id FROM badge_jobs
+        WHERE run_after <= :now AND failed_at IS NULL
+        ORDER BY run_after
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING user_id
+""")
+
+# Records a failed evaluation on the job the rollback restored
+FAIL_SQL = text("""
+    UPDATE badge_jobs SET
+        attempts = attempts + 1,
+        last_error = :error,
+        run_after = :now + make_interval(secs => :retry_delay * power(2, attempts)),
+        failed_at = CASE WHEN attempts + 1 >= :max_attempts THEN CAST(:now AS timestamp) END
+    WHERE user_id = :user_id
+    RETURNING attempts, failed_at
+""")
+
+
+def enqueue_badge_check(db: Session, user_id: UUID):
+    """
+    Queue a badge evaluation for `user_id` in the caller's transaction, without
+    committing. A user with a job already pending, or parked after repeated
+    failures, is not queued again; delete the parked row to retry it.
+    """
+    now = datetime.utcnow()
+    db.execute(
+        insert(BadgeJob)
+        .values(user_id=user_id, run_after=now + DEBOUNCE, enqueued_at=now)
+        .on_conflict_do_nothing(index_elements=[BadgeJob.user_id])
+    )
+
+
+def drain_badge_jobs() -> int:
+    """
+    Evaluate every due job, one short transaction per user so the row lock a
+    concurrent enqueue may wait on is held only for one evaluation.
+    Returns the number of users evaluated.
+    """
+    processed = 0
+    db = SessionLocal()
+    try:
+        while True:
+            user_id = db.execute(CLAIM_SQL, {"now": datetime.utcnow()}).scalar()
+            if user_id is None:
+                db.commit()
+                break
+            try:
+                check_and_award_badges(db, user_id)
+                db.commit()
+                processed += 1
+            except Exception as e:
+                db.rollback()
+                logger.exception("Badge evaluation failed for user %s", user_id)
+                # The rollback restored the job; back it off so the loop moves on
+                job = db.execute(FAIL_SQL, {
+                    "user_id": user_id,
+                    "error": repr(e)[:1000],
+                    "now": datetime.utcnow(),
+                    "retry_delay": RETRY_DELAY.total_seconds(),
+                    "max_attempts": MAX_ATTEMPTS,
+                }).one()
+                db.commit()
+                if job.failed_at is not None:
+                    logger.error("Parked the badge job for user %s after %d failures", user_id, job.attempts)
+    finally:
+        db.close()
+    return processed
+
+
+register(PeriodicWorker("badge-queue", drain_badge_jobs, DRAIN_INTERVAL))
@@ -1,50 +1,82 @@
-from app.crud.badge import get_all_badges, user_has_badge, award_badge
-from app.crud.notification import notify_badge_earned
+from app.crud.notification import notify_badges_earned
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import datetime, timezone
-from app.models import Badge, User
-
-
-def check_and_award_badges(db: Session, user: User) -> List[Badge]:
-    earned = []
-    
-    now = datetime.now(timezone.utc)
-    days_since_join = (now - user.created_at).days
-
-    # Calculate user stats
-    stats = {
-        "answers_posted": len(user.answers),
-        "approved_answers": user.approved_answers_count(),
-        "reputation": user.reputation,
-        "questions_posted": len(user.questions),
-        "upvotes_received": sum(1 for vote in user.answer_votes if vote.vote_value.name == "up"),
-        "downvotes_received": sum(1 for vote in user.answer_votes if vote.vote_value.name == "down"),
-        "join_date": days_since_join,
-        "consecutive_days": 7,  # This would need to be calculated from login history
-        "tags_created": 0,  # This would need to be calculated
-        "edits_made": 0,  # This would need to be calculated
-    }
-
-    for badge in get_all_badges(db):
-        crit = badge.criteria or {}
-        badge_type = crit.get("type")
-
-        if badge_type == "join_date":
-            threshold_days = crit.get("threshold_days", 0)
-            if days_since_join >= threshold_days:
-                if not user_has_badge(db, user.id, badge.id):
-                    award_badge(db, user.id, badge.id)
-                    notify_badge_earned(db, user.id, badge.name, badge.id)
-                    earned.append(badge)
-
-        elif badge_type in stats:
-            user_stat = stats[badge_type]
-            threshold = crit.get("threshold", 0)
-            if user_stat >= threshold:
-                if not user_has_badge(db, user.id, badge.id):
-                    award_badge(db, user.id, badge.id)
-                    notify_badge_earned(db, user.id, badge.name, badge.id)
-                    earned.append(badge)
+from uuid import UUID
+from app.models import Badge, user_badges
+from app.schemas.badge import Badge as BadgeSchema
+from app.services.badge_catalog import badge_catalog
 
+
+# Every stat a badge criterion can refer to, as a SQL expression over a users row `u`.
+# Shared by the per-user check below and the bulk backfill.
+STAT_SQL = {
+    "answers_posted": "(SELECT COUNT(*) FROM answers a WHERE a.author_id = u.id)",
+    "approved_answers": "(SELECT COUNT(*) FROM answers a WHERE a.author_id = u.id AND a.is_helpful)",
+    "reputation": "u.reputation",
+    "questions_posted": "(SELECT COUNT(*) FROM questions q WHERE q.author_id = u.id)",
+    "upvotes_received": (
+        "(SELECT COUNT(*) FROM answer_votes v JOIN answers a ON a.id = v.answer_id"
+        " WHERE a.author_id = u.id AND v.vote_value = 'up')"
+    ),
+    "downvotes_received": (
+        "(SELECT COUNT(*) FROM answer_votes v JOIN answers a ON a.id = v.answer_id"
+        " WHERE a.author_id = u.id AND v.vote_value = 'down')"
+    ),
+    "join_date": "EXTRACT(DAY FROM timezone('utc', now()) - u.created_at)",
+    "consecutive_days": "7",  # This would need to be calculated from login history
+    "tags_created": "0",  # This would need to be calculated
+    "edits_made": "0",  # This would need to be calculated
+}
+
+USER_STATS_SQL = text(
+    "SELECT "
+    + ", ".join(f"{expr} AS {name}" for name, expr in STAT_SQL.items())
+    + " FROM users u WHERE u.id = :user_id"
+)
+
+
+def badge_requirement(badge: Badge):
+    """The (stat, threshold) a badge's criteria require, or None if it can't be evaluated."""
+    crit = badge.criteria or {}
+    badge_type = crit.get("type")
+    if badge_type == "join_date":
+        return badge_type, crit.get("threshold_days", 0)
+    if badge_type in STAT_SQL:
+        return badge_type, crit.get("threshold", 0)
+    return None
+
+
+def get_user_stats(db: Session, user_id: UUID) -> dict:
+    """All badge stats for one user, from a single aggregate query."""
+    row = db.execute(USER_STATS_SQL, {"user_id": user_id}).mappings().first()
+    return dict(row) if row else {}
+
+
+def check_and_award_badges(db: Session, user_id: UUID) -> List[BadgeSchema]:
+    """
+    Award every badge `user_id` has newly earned, with their notifications,
+    without committing. Runs from the badge queue (app.services.badge_queue).
+    """
+    stats = get_user_stats(db, user_id)
+    if not stats:
+        return []
+
+    eligible = {badge.id: badge for badge in badge_catalog.get(db).eligible(stats)}
+    if not eligible:
+        return []
+
+    # Diff against held badges and award in one idempotent statement:
+    # RETURNING yields only the rows that were actually inserted
+    awarded_ids = db.execute(
+        insert(user_badges)
+        .values([{"user_id": user_id, "badge_id": badge_id} for badge_id in eligible])
+        .on_conflict_do_nothing()
+        .returning(user_badges.c.badge_id)
+    ).scalars().all()
+
+    earned = [eligible[badge_id] for badge_id in awarded_ids]
+    if earned:
+        notify_badges_earned(db, user_id, earned)
     return earned
@@ -0,0 +1,87 @@
+from collections import Counter
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import Question, QuestionCounter
+from app.schemas.question import TotalMode
+
+
+def count_questions(
+    db: Session,
+    query,
+    mode: TotalMode = TotalMode.exact,
+    scope: Optional[str] = None,
+    scope_id: Optional[UUID] = None,
+) -> Optional[int]:
+    """
+    Total for a paginated question listing.
+
+    - exact: the maintained counter for (scope, scope_id), falling back to COUNT(*)
+      when there is no scope or the counter row does not exist yet
+    - estimate: pg_class statistics for the whole table, the planner's row estimate otherwise
+    - none: skip counting entirely
+    """
+    if mode == TotalMode.none:
+        return None
+
+    if mode == TotalMode.estimate:
+        if scope is None:
+            return estimate_table_rows(db, Question.__tablename__)
+        return estimate_query_rows(db, query)
+
+    if scope is not None:
+        count = (
+            db.query(QuestionCounter.count)
+            .filter(QuestionCounter.scope == scope, QuestionCounter.scope_id == scope_id)
+            .scalar()
+        )
+        if count is not None:
+            return count
+    return query.count()
+
+
+def estimate_table_rows(db: Session, table_name: str) -> int:
+    """Row count from pg_class; -1 (never analyzed) is reported as 0."""
+    reltuples = db.execute(
+        text("SELECT reltuples FROM pg_class WHERE relname = :table_name"),
+        {"table_name": table_name},
+    ).scalar()
+    return max(int(reltuples or 0), 0)
+
+
+def estimate_query_rows(db: Session, query) -> int:
+    """The planner's row estimate for `query`, without executing it."""
+    compiled = query.statement.compile(
+        dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def question_scopes(category_id: UUID, author_id: UUID, tag_ids: Iterable[UUID]) -> list:
+    """The counter keys a question with these attributes contributes to."""
+    return [("category", category_id), ("author", author_id)] + [("tag", tag_id) for tag_id in tag_ids]
+
+
+def adjust_question_counters(db: Session, deltas: Counter) -> None:
+    """
+    Apply {(scope, scope_id): delta} to the counters as part of the caller's transaction.
+    """
+    rows = [
+        {"scope": scope, "scope_id": scope_id, "count": delta}
+        for (scope, scope_id), delta in sorted(deltas.items(), key=lambda item: (item[0][0], str(item[0][1])))
+        if delta and scope_id is not None
+    ]
+    if not rows:
+        return
+
+    stmt = insert(QuestionCounter).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[QuestionCounter.scope, QuestionCounter.scope_id],
+        set_={"count": QuestionCounter.count + stmt.excluded["count"]},
+    )
+    db.execute(stmt)
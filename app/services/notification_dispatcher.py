@@ -0,0 +1,171 @@
+import os
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.services.background import PeriodicWorker, register
+from app.services.notification_stream import CHANNEL
+from app.services.unread_counts import unread_counts
+
+DISPATCH_INTERVAL = float(os.environ.get("NOTIFICATION_DISPATCH_INTERVAL", "1"))
+BATCH_SIZE = 1000
+# Seconds after it was created that an unread notification still absorbs new
+# events of the same type on the same target; 0 always inserts new rows. The
+# bound keeps coalesced rows near the top of the created_at-ordered inbox.
+COALESCE_WINDOW = float(os.environ.get("NOTIFICATION_COALESCE_WINDOW", "3600"))
+# Where a notification summing up several badges points
+BADGES_LINK = "/badges"
+
+# Moves one batch from the outbox into notifications in a single statement.
+# The batch is grouped by (user, type, target); a NULL target groups too, so a
+# burst of badges becomes one row, which then names the number of badges
+# rather than the last one. Each group is folded into the recipient's unread
+# notification for that key when that notification was created within the
+# window, and inserted otherwise. Only inserted rows add to the unread
+# counters. Each recipient's connected clients get the new unread count and
+# latest notification over NOTIFY when the batch commits.
+# Returns one row per recipient.
+DISPATCH_SQL = text("""
+    WITH batch AS (
+        DELETE FROM notification_outbox
+        WHERE id IN (
+            SELECT id FROM notification_outbox
+            ORDER BY id
+            LIMIT :batch_size
+        )
+        RETURNING id, user_id, type, target_id, actor_id, message, link, created_at
+    ),
+    grouped AS (
+        SELECT DISTINCT ON (user_id, type, target_id)
+            user_id, type, target_id, actor_id, message, link, created_at,
+            COUNT(*) OVER (PARTITION BY user_id, type, target_id) AS events
+        FROM batch
+        ORDER BY user_id, type, target_id, id DESC
+    ),
+    existing AS (
+        SELECT DISTINCT ON (g.user_id, g.type, g.target_id) n.id, g.user_id, g.type, g.target_id
+        FROM grouped g
+        JOIN notifications n
+            ON n.user_id = g.user_id
+            AND n.type = g.type
+            AND n.target_id IS NOT DISTINCT FROM g.target_id
+            AND n.is_read = false
+            AND n.created_at >= g.created_at - make_interval(secs => :coalesce_window)
+        WHERE :coalesce_window > 0
+        ORDER BY g.user_id, g.type, g.target_id, n.created_at DESC
+    ),
+    updated AS (
+        UPDATE notifications n SET
+            event_count = n.event_count + g.events,
+            last_actor_id = COALESCE(g.actor_id, n.last_actor_id),
+            message = CASE WHEN g.type = 'badge_earned'
+                THEN 'Congratulations! You earned ' || (n.event_count + g.events) || ' badges'
+                ELSE g.message END,
+            link = CASE WHEN g.type = 'badge_earned' THEN :badges_link ELSE g.link END,
+            updated_at = g.created_at
+        FROM existing e
+        JOIN grouped g
+            ON g.user_id = e.user_id
+            AND g.type = e.type
+            AND g.target_id IS NOT DISTINCT FROM e.target_id
+        -- Re-checked on the current row, so one read meanwhile gets a new row
+        WHERE n.id = e.id AND n.is_read = false
+        RETURNING n.id, n.user_id, n.type, n.target_id, n.event_count, n.message, n.link, n.created_at, n.updated_at
+    ),
+    inserted AS (
+        INSERT INTO notifications (
+            id, user_id, type, target_id, event_count, last_actor_id,
+            message, link, is_read, created_at, updated_at
+        )
+        SELECT
+            gen_random_uuid(), user_id, type, target_id, events, actor_id,
+            CASE WHEN type = 'badge_earned' AND events > 1
+                THEN 'Congratulations! You earned ' || events || ' badges'
+                ELSE message END,
+            CASE WHEN type = 'badge_earned' AND events > 1 THEN :badges_link ELSE link END,
+            false, created_at, created_at
+        FROM grouped g
+        WHERE NOT EXISTS (
+            SELECT 1 FROM updated u
+            WHERE u.user_id = g.user_id
+                AND u.type = g.type
+                AND u.target_id IS NOT DISTINCT FROM g.target_id
+        )
+        RETURNING id, user_id, type, target_id, event_count, message, link, created_at, updated_at
+    ),
+    delivered AS (
+        SELECT *, true AS is_new FROM inserted
+        UNION ALL
+        SELECT *, false AS is_new FROM updated
+    ),
+    per_user AS (
+        SELECT DISTINCT ON (user_id)
+            user_id, id, type, target_id, event_count, message, link, created_at, updated_at,
+            COUNT(*) FILTER (WHERE is_new) OVER (PARTITION BY user_id) AS new
+        FROM delivered
+        ORDER BY user_id, updated_at DESC
+    ),
+    counted AS (
+        INSERT INTO notification_counters (user_id, unread)
+        SELECT user_id, new FROM per_user
+        ON CONFLICT (user_id) DO UPDATE SET unread = notification_counters.unread + EXCLUDED.unread
+        RETURNING user_id, unread
+    )
+    SELECT
+        c.user_id,
+        (SELECT COUNT(*) FROM batch) AS dispatched,
+        pg_notify(:channel, json_build_object(
+            'user_id', c.user_id,
+            'unread', c.unread,
+            'new', p.new,
+            'latest', json_build_object(
+                'id', p.id,
+                'type', p.type,
+                'target_id', p.target_id,
+                'event_count', p.event_count,
+                'message', left(p.message, 500),
+                'link', p.link,
+                'created_at', p.created_at,
+                'updated_at', p.updated_at
+            )
+        )::text)
+    FROM counted c
+    JOIN per_user p ON p.user_id = c.user_id
+""")
+
+
+def dispatch_notifications(batch_size: int = BATCH_SIZE) -> int:
+    """
+    Deliver queued notifications in bulk. Each batch commits on its own; an
+    advisory lock keeps one dispatcher running across worker processes.
+    Returns the number of queued events delivered.
+    """
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            if not db.execute(text("SELECT pg_try_advisory_xact_lock(hashtext('notification_dispatch'))")).scalar():
+                db.rollback()
+                break  # Another process is dispatching
+            recipients = db.execute(
+                DISPATCH_SQL,
+                {
+                    "batch_size": batch_size,
+                    "coalesce_window": COALESCE_WINDOW,
+                    "badges_link": BADGES_LINK,
+                    "channel": CHANNEL,
+                },
+            ).all()
+            db.commit()
+            if not recipients:
+                break
+            unread_counts.invalidate(*(row.user_id for row in recipients))
+            total += recipients[0].dispatched
+            if recipients[0].dispatched < batch_size:
+                break
+    finally:
+        db.close()
+    return total
+
+
+register(PeriodicWorker("notification-dispatcher", dispatch_notifications, DISPATCH_INTERVAL, run_on_stop=True))
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from collections import defaultdict
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.services.background import register
+from app.services.unread_counts import unread_counts
+
+logger = logging.getLogger(__name__)
+
+# Postgres LISTEN/NOTIFY channel the dispatcher and read/delete paths publish on
+CHANNEL = "notification_events"
+# Events buffered per connection before the oldest are dropped
+QUEUE_SIZE = 100
+RECONNECT_DELAY = 5
+HEARTBEAT_INTERVAL = float(os.environ.get("NOTIFICATION_STREAM_HEARTBEAT", "25"))
+
+
+def publish_unread_count(db: Session, user_id: UUID):
+    """
+    Tell connected clients of `user_id` its current unread count once the
+    caller's transaction commits (NOTIFY is transactional).
+    """
+    db.execute(
+        text("""
+            SELECT pg_notify(:channel, json_build_object(
+                'user_id', CAST(:user_id AS text),
+                'unread', COALESCE((SELECT unread FROM notification_counters WHERE user_id = :user_id), 0)
+            )::text)
+        """),
+        {"channel": CHANNEL, "user_id": user_id},
+    )
+
+
+class NotificationBroker:
+    """
+    Fans events out to the stream connections in this process.
+
+    Each connection owns a bounded asyncio.Queue; `publish` may be called from
+    any thread and hands the event to the event loop. Idle connections cost a
+    queue and a suspended task, so one worker holds tens of thousands.
+    """
+
+    def __init__(self):
+        # User id, as text like in NOTIFY payloads -> queues
+        self._subscribers = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        self._loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id: str, event: dict):
+        if user_id in self._subscribers and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._deliver, user_id, event)
+
+    def _deliver(self, user_id: str, event: dict):
+        for queue in self._subscribers.get(user_id, ()):
+            if queue.full():
+                queue.get_nowait()  # A slow client loses its oldest event
+            queue.put_nowait(event)
+
+
+class NotificationListener:
+    """
+    LISTENs on CHANNEL over a dedicated connection, invalidates the user's
+    cached unread count and forwards each event to the broker. Started and
+    stopped with the other background workers.
+    """
+
+    name = "notification-listener"
+
+    def __init__(self, broker: NotificationBroker):
+        self.broker = broker
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Notification listener failed, reconnecting")
+                self._stopping.wait(RECONNECT_DELAY)
+
+    def _listen(self):
+        raw = engine.raw_connection()
+        raw.detach()  # Never hand a LISTENing connection back to the pool
+        conn = raw.driver_connection
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            while not self._stopping.is_set():
+                if select.select([conn], [], [], 1.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self._forward(conn.notifies.pop(0).payload)
+        finally:
+            raw.close()
+
+    def _forward(self, payload: str):
+        try:
+            event = json.loads(payload)
+            user_id = event.pop("user_id")
+            # Every event carries a new unread count, so this process's
+            # cached count is dropped whichever process made the change
+            unread_counts.invalidate(UUID(user_id))
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Ignoring malformed notification event %r", payload)
+            return
+        self.broker.publish(user_id, event)
+
+
+broker = NotificationBroker()
+register(NotificationListener(broker))
+
+
+async def event_stream(user_id: str, queue: asyncio.Queue, unread: int, heartbeat: float = HEARTBEAT_INTERVAL):
+    """
+    Server-Sent Events for one connection: the current unread count, then an
+    `unread` event per count change and a `notification` event per delivery,
+    with a comment line every `heartbeat` seconds to keep proxies from
+    closing the idle connection.
+
+    `queue` must come from `broker.subscribe` before `unread` was read, so
+    nothing published in between is lost; it is unsubscribed when the
+    stream ends.
+    """
+    try:
+        yield _sse("unread", {"count": unread})
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if "latest" in event:
+                yield _sse("notification", {"new": event["new"], **event["latest"]})
+            yield _sse("unread", {"count": event["unread"]})
+    finally:
+        broker.unsubscribe(user_id, queue)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,72 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import tuple_
+
+
+def encode_cursor(values) -> str:
+    """
+    Encode the sort key of the last row on a page into an opaque cursor.
+    """
+    payload = [v.isoformat() if isinstance(v, datetime) else str(v) if isinstance(v, UUID) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor back into typed values for `columns`.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise ValueError("Invalid cursor")
+
+    values = []
+    for column, value in zip(columns, payload):
+        python_type = column.type.python_type
+        try:
+            if python_type is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif python_type is UUID:
+                values.append(UUID(value))
+            else:
+                values.append(python_type(value))
+        except (AttributeError, TypeError, ValueError):
+            # AttributeError: UUID() given a non-string, e.g. a JSON number
+            raise ValueError("Invalid cursor")
+    return tuple(values)
+
+
+def keyset_paginate(query, columns, cursor: str = None, skip: int = 0, limit: int = 10):
+    """
+    Page `query` in descending order of `columns` (the last one must be unique).
+
+    With a cursor the page starts right after the row it points at, so every page
+    is a single index range scan. Without one, `skip` is applied as a plain offset
+    for older clients. Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        query = query.filter(tuple_(*columns) < tuple_(*decode_cursor(cursor, columns)))
+
+    # ORDER BY must come before OFFSET/LIMIT, Query.order_by() refuses it after
+    query = query.order_by(*[c.desc() for c in columns])
+    if not cursor and skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit + 1).all()
+
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in columns])
+    return items, next_cursor
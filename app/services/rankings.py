@@ -0,0 +1,162 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.crud.loaders import loader_options
+from app.database import SessionLocal
+from app.models import Question, QuestionRanking
+from app.schemas.question import QuestionOut
+from app.services.background import PeriodicWorker, register
+
+REFRESH_INTERVAL = float(os.environ.get("RANKINGS_REFRESH_INTERVAL", "60"))
+TRENDING_WINDOW = timedelta(days=7)
+HOT_WINDOW = timedelta(days=3)
+SNAPSHOT_SIZE = 50  # Largest `limit` the trending/hot routes accept
+REFRESH_OVERLAP = timedelta(minutes=1)  # Catches rows committed just after the previous run
+
+# Scores are log10(activity) + age / DECAY_SECONDS, measured from a fixed epoch.
+# Every score decays at the same rate, so ordering never changes with the
+# passage of time alone and only questions with new activity need rescoring.
+SCORE_EPOCH = datetime(2025, 1, 1)
+DECAY_SECONDS = 45000
+
+REFRESH_SQL = text("""
+    WITH touched AS (
+        -- New questions and new answers/edits, via idx_questions_last_activity_at_id
+        SELECT id AS question_id FROM questions WHERE last_activity_at > :since
+        UNION
+        -- Ranked questions whose views, answers or votes moved since they were scored
+        SELECT r.question_id
+        FROM question_rankings r
+        JOIN questions q ON q.id = r.question_id
+        WHERE q.view_count <> r.views OR q.answer_count <> r.answers OR q.score <> r.votes
+    ),
+    stats AS (
+        SELECT
+            q.id,
+            q.created_at,
+            q.view_count,
+            q.answer_count AS answers,
+            a.last_answer_at,
+            q.score AS votes
+        FROM questions q
+        JOIN touched t ON t.question_id = q.id
+        CROSS JOIN LATERAL (
+            SELECT MAX(created_at) AS last_answer_at
+            FROM answers WHERE question_id = q.id
+        ) a
+        WHERE q.created_at > :trending_since OR a.last_answer_at > :hot_since
+    )
+    INSERT INTO question_rankings (
+        question_id, created_at, last_answer_at, views, answers, votes,
+        trending_score, hot_score, refreshed_at
+    )
+    SELECT
+        id, created_at, last_answer_at, view_count, answers, votes,
+        LOG(GREATEST(view_count + 5 * answers + 3 * votes, 1))
+            + EXTRACT(EPOCH FROM created_at - :epoch) / :decay,
+        CASE WHEN last_answer_at IS NOT NULL THEN
+            LOG(GREATEST(5 * answers + 3 * votes, 1))
+                + EXTRACT(EPOCH FROM last_answer_at - :epoch) / :decay
+        END,
+        :now
+    FROM stats
+    ON CONFLICT (question_id) DO UPDATE SET
+        last_answer_at = EXCLUDED.last_answer_at,
+        views = EXCLUDED.views,
+        answers = EXCLUDED.answers,
+        votes = EXCLUDED.votes,
+        trending_score = EXCLUDED.trending_score,
+        hot_score = EXCLUDED.hot_score,
+        refreshed_at = EXCLUDED.refreshed_at
+""")
+
+PRUNE_SQL = text("""
+    DELETE FROM question_rankings
+    WHERE created_at <= :trending_since
+      AND (last_answer_at IS NULL OR last_answer_at <= :hot_since)
+""")
+
+
+class QuestionRankings:
+    """
+    Trending and hot questions, served from an in-memory snapshot.
+
+    A background worker rescores questions with activity since its previous run
+    into `question_rankings` and then reloads the snapshot, so the routes never
+    touch `answers` or `question_votes`.
+    """
+
+    def __init__(self):
+        self.trending: Optional[List[QuestionOut]] = None
+        self.hot: Optional[List[QuestionOut]] = None
+        self.last_refresh: Optional[datetime] = None
+
+    def get_trending(self, db: Session, limit: int) -> List[QuestionOut]:
+        if self.trending is None:
+            self.load_snapshot(db)
+        return self.trending[:limit]
+
+    def get_hot(self, db: Session, limit: int) -> List[QuestionOut]:
+        if self.hot is None:
+            self.load_snapshot(db)
+        return self.hot[:limit]
+
+    def refresh(self):
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            # Only one process rescores at a time; the others just reload the snapshot
+            if db.execute(text("SELECT pg_try_advisory_xact_lock(hashtext('question_rankings'))")).scalar():
+                since = self.last_refresh - REFRESH_OVERLAP if self.last_refresh else now - TRENDING_WINDOW
+                windows = {"trending_since": now - TRENDING_WINDOW, "hot_since": now - HOT_WINDOW}
+                db.execute(REFRESH_SQL, {
+                    **windows,
+                    "since": since,
+                    "now": now,
+                    "epoch": SCORE_EPOCH,
+                    "decay": DECAY_SECONDS,
+                })
+                db.execute(PRUNE_SQL, windows)
+                db.commit()
+                self.last_refresh = now
+            else:
+                db.rollback()
+            self.load_snapshot(db)
+        finally:
+            db.close()
+
+    def load_snapshot(self, db: Session):
+        now = datetime.utcnow()
+        trending_ids = [
+            row.question_id for row in
+            db.query(QuestionRanking.question_id)
+            .filter(QuestionRanking.created_at > now - TRENDING_WINDOW)
+            .order_by(QuestionRanking.trending_score.desc())
+            .limit(SNAPSHOT_SIZE)
+        ]
+        hot_ids = [
+            row.question_id for row in
+            db.query(QuestionRanking.question_id)
+            .filter(QuestionRanking.last_answer_at > now - HOT_WINDOW)
+            .order_by(QuestionRanking.hot_score.desc())
+            .limit(SNAPSHOT_SIZE)
+        ]
+
+        questions = (
+            db.query(Question)
+            .options(*loader_options("question_list"))
+            .filter(Question.id.in_(set(trending_ids) | set(hot_ids)))
+            .all()
+        )
+        by_id = {q.id: QuestionOut.model_validate(q) for q in questions}
+
+        self.trending = [by_id[i] for i in trending_ids if i in by_id]
+        self.hot = [by_id[i] for i in hot_ids if i in by_id]
+
+
+rankings = QuestionRankings()
+register(PeriodicWorker("question-rankings", rankings.refresh, REFRESH_INTERVAL))
@@ -0,0 +1,185 @@
+import logging
+import os
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.services.background import PeriodicWorker, register
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_INTERVAL = float(os.environ.get("RECONCILE_INTERVAL", "3600"))
+BATCH_SIZE = 2000
+
+# Recomputes the denormalized activity columns for one id-ordered batch of
+# questions and rewrites only the rows that drifted.
+QUESTION_ACTIVITY_SQL = text("""
+    WITH batch AS (
+        SELECT id FROM questions
+        WHERE CAST(:after AS uuid) IS NULL OR id > CAST(:after AS uuid)
+        ORDER BY id
+        LIMIT :batch_size
+    ),
+    actual AS (
+        SELECT
+            b.id,
+            (SELECT COUNT(*) FROM answers a WHERE a.question_id = b.id) AS answer_count,
+            v.upvotes,
+            v.downvotes,
+            v.upvotes - v.downvotes AS score,
+            (SELECT MAX(a.created_at) FROM answers a WHERE a.question_id = b.id) AS last_answer_at
+        FROM batch b
+        CROSS JOIN LATERAL (
+            SELECT
+                COUNT(*) FILTER (WHERE v.vote_value = 'up') AS upvotes,
+                COUNT(*) FILTER (WHERE v.vote_value = 'down') AS downvotes
+            FROM question_votes v WHERE v.question_id = b.id
+        ) v
+    ),
+    fixed AS (
+        UPDATE questions q SET
+            answer_count = actual.answer_count,
+            score = actual.score,
+            upvotes = actual.upvotes,
+            downvotes = actual.downvotes,
+            last_activity_at = GREATEST(q.last_activity_at, actual.last_answer_at)
+        FROM actual
+        WHERE q.id = actual.id
+          AND (
+            q.answer_count <> actual.answer_count
+            OR q.score <> actual.score
+            OR q.upvotes <> actual.upvotes
+            OR q.downvotes <> actual.downvotes
+            OR q.last_activity_at < actual.last_answer_at
+          )
+        RETURNING q.id
+    )
+    SELECT
+        (SELECT id FROM batch ORDER BY id DESC LIMIT 1) AS last_id,
+        (SELECT COUNT(*) FROM fixed) AS fixed
+""")
+
+
+# Same for the vote tallies on answers
+ANSWER_VOTES_SQL = text("""
+    WITH batch AS (
+        SELECT id FROM answers
+        WHERE CAST(:after AS uuid) IS NULL OR id > CAST(:after AS uuid)
+        ORDER BY id
+        LIMIT :batch_size
+    ),
+    actual AS (
+        SELECT
+            b.id,
+            COUNT(v.id) FILTER (WHERE v.vote_value = 'up') AS upvotes,
+            COUNT(v.id) FILTER (WHERE v.vote_value = 'down') AS downvotes
+        FROM batch b
+        LEFT JOIN answer_votes v ON v.answer_id = b.id
+        GROUP BY b.id
+    ),
+    fixed AS (
+        UPDATE answers a SET
+            upvotes = actual.upvotes,
+            downvotes = actual.downvotes
+        FROM actual
+        WHERE a.id = actual.id
+          AND (a.upvotes <> actual.upvotes OR a.downvotes <> actual.downvotes)
+        RETURNING a.id
+    )
+    SELECT
+        (SELECT id FROM batch ORDER BY id DESC LIMIT 1) AS last_id,
+        (SELECT COUNT(*) FROM fixed) AS fixed
+""")
+
+
+# Same for the unread notification counters, over an id-ordered batch of users
+UNREAD_COUNTS_SQL = text("""
+    WITH batch AS (
+        SELECT id FROM users
+        WHERE CAST(:after AS uuid) IS NULL OR id > CAST(:after AS uuid)
+        ORDER BY id
+        LIMIT :batch_size
+    ),
+    actual AS (
+        SELECT
+            b.id AS user_id,
+            (SELECT COUNT(*) FROM notifications n WHERE n.user_id = b.id AND n.is_read = false) AS unread
+        FROM batch b
+    ),
+    fixed AS (
+        INSERT INTO notification_counters (user_id, unread)
+        SELECT actual.user_id, actual.unread
+        FROM actual
+        LEFT JOIN notification_counters c ON c.user_id = actual.user_id
+        WHERE actual.unread <> COALESCE(c.unread, 0)
+        ON CONFLICT (user_id) DO UPDATE SET unread = EXCLUDED.unread
+        RETURNING user_id
+    )
+    SELECT
+        (SELECT id FROM batch ORDER BY id DESC LIMIT 1) AS last_id,
+        (SELECT COUNT(*) FROM fixed) AS fixed
+""")
+
+
+def _reconcile_batches(statement, batch_size: int) -> int:
+    """
+    Run a reconcile statement over every id-ordered batch. Each batch commits
+    on its own so row locks are held only briefly. Returns the rows corrected.
+    """
+    total_fixed = 0
+    after = None
+    db = SessionLocal()
+    try:
+        while True:
+            row = db.execute(statement, {"after": after, "batch_size": batch_size}).one()
+            db.commit()
+            if row.last_id is None:
+                break
+            total_fixed += row.fixed
+            after = str(row.last_id)
+    finally:
+        db.close()
+    return total_fixed
+
+
+def reconcile_question_activity(batch_size: int = BATCH_SIZE) -> int:
+    """
+    Repair drift in questions.answer_count / score / upvotes / downvotes /
+    last_activity_at. Returns the number of rows corrected.
+    """
+    total_fixed = _reconcile_batches(QUESTION_ACTIVITY_SQL, batch_size)
+    if total_fixed:
+        logger.warning("Reconciled activity columns on %d questions", total_fixed)
+    return total_fixed
+
+
+def reconcile_answer_votes(batch_size: int = BATCH_SIZE) -> int:
+    """Repair drift in answers.upvotes / downvotes. Returns the number of rows corrected."""
+    total_fixed = _reconcile_batches(ANSWER_VOTES_SQL, batch_size)
+    if total_fixed:
+        logger.warning("Reconciled vote tallies on %d answers", total_fixed)
+    return total_fixed
+
+
+def reconcile_unread_counts(batch_size: int = BATCH_SIZE) -> int:
+    """Repair drift in notification_counters. Returns the number of users corrected."""
+    total_fixed = _reconcile_batches(UNREAD_COUNTS_SQL, batch_size)
+    if total_fixed:
+        logger.warning("Reconciled unread notification counts for %d users", total_fixed)
+    return total_fixed
+
+
+def reconcile_all():
+    reconcile_question_activity()
+    reconcile_answer_votes()
+    reconcile_unread_counts()
+
+
+register(PeriodicWorker("reconcile", reconcile_all, RECONCILE_INTERVAL))
+
+
+if __name__ == "__main__":
+    questions = reconcile_question_activity()
+    answers = reconcile_answer_votes()
+    counters = reconcile_unread_counts()
+    print(f"✅ Reconciled {questions} questions, {answers} answers and {counters} unread counters.")
@@ -0,0 +1,74 @@
+import logging
+import os
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.services.background import PeriodicWorker, register
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_INTERVAL = float(os.environ.get("REPUTATION_ROLLUP_INTERVAL", "10"))
+BATCH_SIZE = 5000
+
+# Marks one id-ordered batch of pending events rolled up, applies their sum to
+# each user's reputation (floored at zero, as votes always were) and adds them
+# to the daily buckets, all in one statement.
+ROLLUP_SQL = text("""
+    WITH events AS (
+        UPDATE reputation_events e SET rolled_up = true
+        FROM (
+            SELECT id FROM reputation_events
+            WHERE rolled_up = false
+            ORDER BY id
+            LIMIT :batch_size
+        ) batch
+        WHERE e.id = batch.id
+        RETURNING e.user_id, e.delta, e.created_at
+    ),
+    per_user AS (
+        SELECT user_id, SUM(delta) AS delta FROM events GROUP BY user_id
+    ),
+    applied AS (
+        UPDATE users u SET reputation = GREATEST(0, u.reputation + per_user.delta)
+        FROM per_user
+        WHERE u.id = per_user.user_id AND per_user.delta <> 0
+        RETURNING u.id
+    ),
+    daily AS (
+        INSERT INTO reputation_daily (user_id, day, delta)
+        SELECT user_id, CAST(created_at AS date), SUM(delta)
+        FROM events
+        GROUP BY user_id, CAST(created_at AS date)
+        ON CONFLICT (user_id, day) DO UPDATE SET delta = reputation_daily.delta + EXCLUDED.delta
+        RETURNING user_id
+    )
+    SELECT COUNT(*) AS events FROM events
+""")
+
+
+def roll_up_reputation(batch_size: int = BATCH_SIZE) -> int:
+    """
+    Apply pending reputation events to users.reputation and reputation_daily.
+    Each batch commits on its own; an advisory lock keeps concurrent workers
+    from rolling up (and locking users rows) at the same time.
+    Returns the number of events applied.
+    """
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            if not db.execute(text("SELECT pg_try_advisory_xact_lock(hashtext('reputation_rollup'))")).scalar():
+                db.rollback()
+                break  # Another process is rolling up
+            applied = db.execute(ROLLUP_SQL, {"batch_size": batch_size}).scalar()
+            db.commit()
+            total += applied
+            if applied < batch_size:
+                break
+    finally:
+        db.close()
+    return total
+
+
+register(PeriodicWorker("reputation-rollup", roll_up_reputation, ROLLUP_INTERVAL))
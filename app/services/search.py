@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.crud import tag as crud_tag, user as crud_user
+from app.crud.loaders import loader_options
+from app.database import SessionLocal
+from app.models import Question
+from app.schemas.question import QuestionOut, SearchMode
+from app.schemas.tag import TagOut
+from app.schemas.user import UserOut
+
+logger = logging.getLogger(__name__)
+
+# Most candidates a full-text query will rank. A query for a common word stops
+# collecting matches here instead of ranking every matching row.
+MAX_CANDIDATES = 1000
+# ts_rank_cd normalization: 1 divides by 1 + log(document length), 32 scales to rank / (rank + 1)
+RANK_NORMALIZATION = 1 | 32
+
+# Default pg_trgm word_similarity a trigram match needs
+TRIGRAM_THRESHOLD = 0.3
+# Trigram indexes can't serve queries shorter than one trigram
+MIN_TRIGRAM_LENGTH = 3
+
+# Per-source deadlines for the unified /search endpoint, in seconds
+SOURCE_TIMEOUTS = {
+    "questions": float(os.environ.get("SEARCH_QUESTIONS_TIMEOUT", "2.0")),
+    "users": float(os.environ.get("SEARCH_USERS_TIMEOUT", "1.0")),
+    "tags": float(os.environ.get("SEARCH_TAGS_TIMEOUT", "1.0")),
+}
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("SEARCH_WORKERS", "12")), thread_name_prefix="search"
+)
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+FULL_TEXT_SQL = """
+    WITH q AS (SELECT {tsquery} AS query),
+    candidates AS (
+        SELECT questions.id, questions.search_vector
+        FROM questions, q
+        WHERE questions.search_vector @@ q.query
+        LIMIT :max_candidates
+    )
+    SELECT c.id
+    FROM candidates c, q
+    ORDER BY ts_rank_cd(c.search_vector, q.query, :normalization) DESC, c.id
+    OFFSET :skip
+    LIMIT :limit
+"""
+
+# `:query <% column` is the indexable form of word_similarity(:query, column) >= threshold.
+# Body matches rank slightly below title matches of the same similarity.
+TRIGRAM_SQL = """
+    WITH candidates AS (
+        SELECT id, title, {body}
+        FROM questions
+        WHERE {where}
+        LIMIT :max_candidates
+    )
+    SELECT id
+    FROM candidates
+    ORDER BY {rank} DESC, id
+    OFFSET :skip
+    LIMIT :limit
+"""
+TRIGRAM_TITLE = dict(
+    body="NULL AS body",
+    where=":query <% title",
+    rank="word_similarity(:query, title)",
+)
+TRIGRAM_TITLE_AND_BODY = dict(
+    body="body",
+    where=":query <% title OR :query <% body",
+    rank="GREATEST(word_similarity(:query, title), 0.8 * word_similarity(:query, body))",
+)
+
+
+def build_tsquery(query: str, mode: SearchMode):
+    """
+    SQL for the tsquery of `query` and its bind parameters.
+
+    websearch_to_tsquery accepts arbitrary user input (quotes, `or`, `-term`)
+    without raising. In prefix mode the last word also matches as a prefix,
+    for search-as-you-type.
+    """
+    if mode == SearchMode.prefix:
+        words = WORD_RE.findall(query)
+        if words:
+            head = query[:query.rfind(words[-1])]
+            return (
+                "websearch_to_tsquery('english', :head) && to_tsquery('english', :prefix)",
+                {"head": head, "prefix": f"{words[-1]}:*"},
+            )
+    return "websearch_to_tsquery('english', :query)", {"query": query}
+
+
+def search_full_text(
+    db: Session,
+    query: str,
+    mode: SearchMode = SearchMode.websearch,
+    skip: int = 0,
+    limit: int = 20,
+    profile: Optional[str] = None,
+    max_candidates: int = MAX_CANDIDATES,
+) -> List[Question]:
+    """
+    Ranked full-text search over questions.search_vector.
+
+    The tsquery is computed once per statement, and at most `max_candidates`
+    matches are ranked. Pages past the candidate cap come back empty.
+    """
+    if not WORD_RE.search(query) or skip >= max_candidates:
+        return []
+
+    tsquery, params = build_tsquery(query, mode)
+    ids: List[UUID] = [
+        row.id for row in db.execute(
+            text(FULL_TEXT_SQL.format(tsquery=tsquery)),
+            {
+                **params,
+                "max_candidates": max_candidates,
+                "normalization": RANK_NORMALIZATION,
+                "skip": skip,
+                "limit": min(limit, max_candidates - skip),
+            },
+        )
+    ]
+    return load_in_order(db, ids, profile)
+
+
+def load_in_order(db: Session, ids: List[UUID], profile: Optional[str]) -> List[Question]:
+    """Load questions by id with a loader profile, keeping the order of `ids`."""
+    if not ids:
+        return []
+    questions = db.query(Question).options(*loader_options(profile)).filter(Question.id.in_(ids)).all()
+    by_id = {q.id: q for q in questions}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def search_trigram(
+    db: Session,
+    query: str,
+    threshold: float = TRIGRAM_THRESHOLD,
+    title_only: bool = False,
+    skip: int = 0,
+    limit: int = 20,
+    profile: Optional[str] = None,
+    max_candidates: int = MAX_CANDIDATES,
+) -> List[Question]:
+    """
+    Typo-tolerant substring search, served by the pg_trgm GIN indexes on
+    title and body and ordered by word similarity. `title_only` skips the
+    (much larger) body index.
+    """
+    query = query.strip()
+    if len(query) < MIN_TRIGRAM_LENGTH or skip >= max_candidates:
+        return []
+
+    # Scoped to this transaction, so pooled connections keep the default
+    db.execute(
+        text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+        {"threshold": str(threshold)},
+    )
+    sql = TRIGRAM_SQL.format(**(TRIGRAM_TITLE if title_only else TRIGRAM_TITLE_AND_BODY))
+    ids: List[UUID] = [
+        row.id for row in db.execute(
+            text(sql),
+            {
+                "query": query,
+                "max_candidates": max_candidates,
+                "skip": skip,
+                "limit": min(limit, max_candidates - skip),
+            },
+        )
+    ]
+    return load_in_order(db, ids, profile)
+
+
+def _search_questions(db: Session, query: str) -> List[QuestionOut]:
+    return [QuestionOut.model_validate(q) for q in search_full_text(db, query, profile="question_list")]
+
+
+def _search_users(db: Session, query: str) -> List[UserOut]:
+    return [UserOut.model_validate(u) for u in crud_user.get_users_fuzzy(db, query)]
+
+
+def _search_tags(db: Session, query: str) -> List[TagOut]:
+    return [TagOut.model_validate(t) for t in crud_tag.get_tags_fuzzy(db, query)]
+
+
+SOURCES = {
+    "questions": _search_questions,
+    "users": _search_users,
+    "tags": _search_tags,
+}
+
+
+def _run_source(name: str, query: str):
+    """Run one source on its own session, serializing before the session closes."""
+    db = SessionLocal()
+    try:
+        # Stop the database work too once the caller has given up on this source
+        db.execute(
+            text("SELECT set_config('statement_timeout', :timeout, true)"),
+            {"timeout": f"{int(SOURCE_TIMEOUTS[name] * 1000)}ms"},
+        )
+        return SOURCES[name](db, query)
+    finally:
+        db.close()
+
+
+async def unified_search(query: str) -> dict:
+    """
+    Run every search source concurrently, each on its own connection.
+
+    A source that errors or misses its deadline contributes an empty list and is
+    listed in `timed_out` / `failed`, with `partial` set, instead of holding back
+    the others. Latency tracks the slowest source rather than their sum.
+    """
+    loop = asyncio.get_running_loop()
+    names = list(SOURCES)
+    outcomes = await asyncio.gather(
+        *(
+            asyncio.wait_for(loop.run_in_executor(_executor, _run_source, name, query), SOURCE_TIMEOUTS[name])
+            for name in names
+        ),
+        return_exceptions=True,
+    )
+
+    results = {"timed_out": [], "failed": []}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            results["timed_out"].append(name)
+            results[name] = []
+        elif isinstance(outcome, Exception):
+            logger.error("Search source %s failed", name, exc_info=outcome)
+            results["failed"].append(name)
+            results[name] = []
+        else:
+            results[name] = outcome
+    results["partial"] = bool(results["timed_out"] or results["failed"])
+    return results
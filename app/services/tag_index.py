@@ -0,0 +1,76 @@
+import bisect
+import os
+import threading
+import time
+from typing import List, Optional
+
+from rapidfuzz import fuzz, process
+from sqlalchemy.orm import Session
+
+from app.models import Tag
+from app.schemas.tag import TagOut
+
+# Upper bound on staleness for tags written by other worker processes
+TTL = float(os.environ.get("TAG_INDEX_TTL", "60"))
+
+
+class TagIndex:
+    """
+    Every tag, cached in memory and sorted by normalized name.
+
+    The sorted names answer prefix lookups with a binary search and are scored
+    in one RapidFuzz call for fuzzy matching. create_tag, update_tag and
+    delete_tag invalidate the cache; the next lookup rebuilds it.
+    """
+
+    def __init__(self, ttl: float = TTL):
+        self.ttl = ttl
+        # (sorted normalized names, TagOut in the same order, built at)
+        self._snapshot = None
+        # Bumped by invalidate(): a load that read the tags under an older
+        # generation may have missed the change and is not kept
+        self._generation = 0
+        self._lock = threading.Lock()  # One rebuild at a time
+        self._state_lock = threading.Lock()  # Guards _snapshot and _generation
+
+    def invalidate(self):
+        with self._state_lock:
+            self._generation += 1
+            self._snapshot = None
+
+    def _load(self, db: Session):
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot[2] < self.ttl:
+            return snapshot
+        with self._lock:
+            with self._state_lock:
+                snapshot, generation = self._snapshot, self._generation
+            if snapshot is None or time.monotonic() - snapshot[2] >= self.ttl:
+                tags = sorted(
+                    (TagOut(id=tag_id, name=name) for tag_id, name in db.query(Tag.id, Tag.name)),
+                    key=lambda tag: tag.name.casefold(),
+                )
+                snapshot = ([tag.name.casefold() for tag in tags], tags, time.monotonic())
+                with self._state_lock:
+                    if self._generation == generation:
+                        self._snapshot = snapshot
+        return snapshot
+
+    def autocomplete(self, db: Session, prefix: str, limit: int = 10) -> List[TagOut]:
+        """Tags whose name starts with `prefix`, case-insensitively, in name order."""
+        keys, tags, _ = self._load(db)
+        prefix = prefix.casefold()
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + "\U0010ffff", lo=start)
+        return tags[start:min(end, start + limit)]
+
+    def fuzzy(self, db: Session, query: str, threshold: int = 70, limit: Optional[int] = None) -> List[TagOut]:
+        """Tags whose name partially matches `query` above `threshold`, best first."""
+        keys, tags, _ = self._load(db)
+        matches = process.extract(
+            query.casefold(), keys, scorer=fuzz.partial_ratio, processor=None, score_cutoff=threshold, limit=limit
+        )
+        return [tags[index] for _, _, index in matches]
+
+
+tag_index = TagIndex()
@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models import NotificationCounter
+from app.services.background import PeriodicWorker, register
+
+# Upper bound on staleness should an invalidation from another process be
+# missed; changes normally arrive through NotificationListener
+TTL = float(os.environ.get("UNREAD_COUNT_TTL", "60"))
+# How long an invalidation is remembered for reads that started before it
+INVALIDATION_MEMORY = 60
+
+
+class UnreadCountCache:
+    """
+    Unread notification counts per user, cached in memory in front of
+    notification_counters. Writers in this process invalidate the user's
+    entry, and every process invalidates it again when the change's NOTIFY
+    event arrives (see app.services.notification_stream).
+    """
+
+    def __init__(self, ttl: float = TTL):
+        self.ttl = ttl
+        self._entries = {}  # user id -> (count, expires at)
+        # user id -> (stamp, invalidated at); a read that started before the
+        # user's latest stamp may have missed the change and is not stored
+        self._invalidated = {}
+        self._stamp = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, user_id: UUID) -> int:
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        started = self._stamp
+        count = (
+            db.query(NotificationCounter.unread)
+            .filter(NotificationCounter.user_id == user_id)
+            .scalar()
+        ) or 0
+        with self._lock:
+            if self._invalidated.get(user_id, (0, 0))[0] <= started:
+                self._entries[user_id] = (count, time.monotonic() + self.ttl)
+        return count
+
+    def invalidate(self, *user_ids: UUID):
+        with self._lock:
+            self._stamp += 1
+            now = time.monotonic()
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+                self._invalidated[user_id] = (self._stamp, now)
+
+    def prune(self):
+        """Drop expired entries so users who stopped polling don't accumulate."""
+        now = time.monotonic()
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+            self._invalidated = {
+                k: v for k, v in self._invalidated.items() if now - v[1] < INVALIDATION_MEMORY
+            }
+
+
+unread_counts = UnreadCountCache()
+register(PeriodicWorker("unread-count-prune", unread_counts.prune, 60))
@@ -0,0 +1,119 @@
+import os
+import threading
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from rapidfuzz import fuzz, process
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import User
+from app.services.background import PeriodicWorker, register
+
+# Full rebuilds pick up users written by other worker processes
+REFRESH_INTERVAL = float(os.environ.get("USER_INDEX_REFRESH_INTERVAL", "300"))
+
+
+def normalize(name: Optional[str]) -> str:
+    return (name or "").strip().casefold()
+
+
+class UserNameIndex:
+    """
+    Normalized usernames and display names of every user, for fuzzy user search.
+
+    Names live in one flat list: slot 2*i is user i's username, slot 2*i + 1 its
+    display name, so RapidFuzz scores both for all users in a single C-level
+    `process.extract` call. Writers build a new snapshot and swap it in, so
+    searches never take a lock.
+    """
+
+    def __init__(self):
+        # (user ids, names, {user id: position})
+        self._snapshot: Optional[Tuple[List[UUID], List[str], dict]] = None
+        self._write_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def ensure_loaded(self, db: Session):
+        if self._snapshot is None:
+            self.rebuild(db)
+
+    def rebuild(self, db: Session):
+        rows = db.query(User.id, User.username, User.display_name).all()
+        ids, names = [], []
+        for user_id, username, display_name in rows:
+            ids.append(user_id)
+            names.append(normalize(username))
+            names.append(normalize(display_name))
+        with self._write_lock:
+            self._snapshot = (ids, names, {user_id: i for i, user_id in enumerate(ids)})
+
+    def refresh(self):
+        if self._snapshot is None:
+            return  # Nothing searched in this process yet
+        db = SessionLocal()
+        try:
+            self.rebuild(db)
+        finally:
+            db.close()
+
+    def upsert(self, user_id: UUID, username: str, display_name: Optional[str]):
+        with self._write_lock:
+            if self._snapshot is None:
+                return  # Built in full on first search
+            ids, names, positions = self._snapshot
+            names = list(names)
+            position = positions.get(user_id)
+            if position is None:
+                ids = ids + [user_id]
+                positions = {**positions, user_id: len(ids) - 1}
+                names += [normalize(username), normalize(display_name)]
+            else:
+                names[2 * position] = normalize(username)
+                names[2 * position + 1] = normalize(display_name)
+            self._snapshot = (ids, names, positions)
+
+    def remove(self, user_id: UUID):
+        with self._write_lock:
+            if self._snapshot is None or user_id not in self._snapshot[2]:
+                return
+            ids, names, positions = self._snapshot
+            ids, names, positions = list(ids), list(names), dict(positions)
+            # Move the last user into the freed slot
+            position = positions.pop(user_id)
+            last = len(ids) - 1
+            if position != last:
+                ids[position] = ids[last]
+                names[2 * position:2 * position + 2] = names[2 * last:2 * last + 2]
+                positions[ids[position]] = position
+            del ids[last]
+            del names[2 * last:]
+            self._snapshot = (ids, names, positions)
+
+    def search(self, query: str, threshold: int = 70, limit: int = 20) -> List[Tuple[UUID, float]]:
+        """Best-scoring users as (user id, score), highest first."""
+        query = normalize(query)
+        if not query or self._snapshot is None:
+            return []
+        ids, names, _ = self._snapshot
+
+        matches = process.extract(
+            query, names, scorer=fuzz.partial_ratio, processor=None, score_cutoff=threshold, limit=None
+        )
+        results, seen = [], set()
+        for _, score, slot in matches:  # Sorted by score, best first
+            user_id = ids[slot // 2]
+            if user_id in seen:
+                continue
+            seen.add(user_id)
+            results.append((user_id, score))
+            if len(results) == limit:
+                break
+        return results
+
+
+user_index = UserNameIndex()
+register(PeriodicWorker("user-index", user_index.refresh, REFRESH_INTERVAL))
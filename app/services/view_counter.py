@@ -0,0 +1,87 @@
+import os
+import threading
+from collections import defaultdict
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.services.background import PeriodicWorker, register
+
+FLUSH_INTERVAL = float(os.environ.get("VIEW_COUNT_FLUSH_INTERVAL", "5"))
+FLUSH_EVERY = int(os.environ.get("VIEW_COUNT_FLUSH_EVERY", "500"))
+BATCH_SIZE = 1000
+
+
+class ViewCounter:
+    """
+    Accumulates question views in memory and writes them back in bulk.
+
+    Detail reads stay read-only; a background worker applies the summed
+    increments with one UPDATE ... FROM (VALUES ...) every FLUSH_INTERVAL
+    seconds, or sooner once FLUSH_EVERY views are pending.
+    """
+
+    def __init__(self, flush_every: int = FLUSH_EVERY):
+        self.flush_every = flush_every
+        self._pending = defaultdict(int)
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self.worker = None
+
+    def record(self, question_id: UUID):
+        with self._lock:
+            self._pending[question_id] += 1
+            self._pending_total += 1
+            full = self._pending_total >= self.flush_every
+        if full and self.worker:
+            self.worker.wake()
+
+    def pending_views(self, question_id: UUID) -> int:
+        with self._lock:
+            return self._pending.get(question_id, 0)
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, defaultdict(int)
+            self._pending_total = 0
+        if not batch:
+            return
+
+        try:
+            write_view_counts(batch)
+        except Exception:
+            # Put the views back so the next flush retries them
+            with self._lock:
+                for question_id, views in batch.items():
+                    self._pending[question_id] += views
+                    self._pending_total += views
+            raise
+
+
+def write_view_counts(batch: dict):
+    """Add {question_id: views} to questions.view_count in one transaction."""
+    items = sorted(batch.items(), key=lambda item: str(item[0]))
+    with engine.begin() as connection:
+        for start in range(0, len(items), BATCH_SIZE):
+            chunk = items[start:start + BATCH_SIZE]
+            values = ", ".join(f"(CAST(:id_{i} AS uuid), :views_{i})" for i in range(len(chunk)))
+            params = {}
+            for i, (question_id, views) in enumerate(chunk):
+                params[f"id_{i}"] = str(question_id)
+                params[f"views_{i}"] = views
+            connection.execute(
+                text(f"""
+                    UPDATE questions AS q
+                    SET view_count = q.view_count + v.views
+                    FROM (VALUES {values}) AS v(id, views)
+                    WHERE q.id = v.id
+                """),
+                params,
+            )
+
+
+view_counter = ViewCounter()
+view_counter.worker = register(
+    PeriodicWorker("view-counter", view_counter.flush, FLUSH_INTERVAL, run_on_stop=True)
+)
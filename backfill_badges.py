@@ -0,0 +1,111 @@
+"""
+Award badges to every existing user who already meets their criteria.
+
+New activity is evaluated by the badge queue; run this after adding a badge
+(seed_badges.py or POST /api/badges/) or changing a badge's criteria.
+Each badge is evaluated with set-based SQL over id-ordered chunks of users,
+inserting the awards and queueing their notifications in one statement
+per chunk. Users who already hold a badge are skipped, so it is safe to
+run again or to resume one badge with --badge and --after.
+
+    python backfill_badges.py [--badge NAME [--after UUID]] [--chunk-size N]
+"""
+import argparse
+import time
+from datetime import datetime
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.models import Badge
+from app.services.badges import STAT_SQL, badge_requirement
+
+AWARD_SQL = """
+    WITH chunk AS (
+        SELECT id FROM users
+        WHERE CAST(:after AS uuid) IS NULL OR id > CAST(:after AS uuid)
+        ORDER BY id
+        LIMIT :chunk_size
+    ),
+    awarded AS (
+        INSERT INTO user_badges (user_id, badge_id)
+        SELECT u.id, CAST(:badge_id AS uuid)
+        FROM users u
+        JOIN chunk ON chunk.id = u.id
+        WHERE {stat} >= :threshold
+        ON CONFLICT DO NOTHING
+        RETURNING user_id
+    ),
+    notified AS (
+        INSERT INTO notification_outbox (user_id, type, message, link, created_at)
+        SELECT user_id, CAST('badge_earned' AS notificationtype), :message, :link, :now
+        FROM awarded
+        RETURNING id
+    )
+    SELECT
+        (SELECT id FROM chunk ORDER BY id DESC LIMIT 1) AS last_id,
+        (SELECT COUNT(*) FROM chunk) AS scanned,
+        (SELECT COUNT(*) FROM notified) AS awarded
+"""
+
+
+def backfill_badge(db, badge: Badge, chunk_size: int, after: str) -> int:
+    stat, threshold = badge_requirement(badge)
+    statement = text(AWARD_SQL.format(stat=STAT_SQL[stat]))
+    params = {
+        "badge_id": str(badge.id),
+        "threshold": threshold,
+        # Same wording as app.crud.notification.notify_badges_earned
+        "message": f"Congratulations! You earned the '{badge.name}' badge",
+        "link": f"/badges/{badge.id}",
+        "chunk_size": chunk_size,
+    }
+
+    scanned = awarded = 0
+    started = time.monotonic()
+    while True:
+        row = db.execute(statement, {**params, "after": after, "now": datetime.utcnow()}).one()
+        db.commit()
+        if row.last_id is None:
+            break
+
+        scanned += row.scanned
+        awarded += row.awarded
+        after = str(row.last_id)
+        rate = scanned / max(time.monotonic() - started, 1e-6)
+        print(f"{badge.name}: {scanned} users checked, {awarded} awarded ({rate:.0f} users/s), resume with --badge {badge.name!r} --after {after}")
+    return awarded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--badge", help="Only evaluate the badge with this name")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Users evaluated per statement")
+    parser.add_argument("--after", help="Resume the --badge run after this user id")
+    args = parser.parse_args()
+    if args.after and not args.badge:
+        # A resume point is only meaningful for the badge that printed it
+        parser.error("--after requires --badge")
+
+    db = SessionLocal()
+    try:
+        query = db.query(Badge).order_by(Badge.name)
+        if args.badge:
+            query = query.filter(Badge.name == args.badge)
+        badges = query.all()
+        if not badges:
+            print(f"❌ No badge named {args.badge!r}.")
+            return
+
+        for badge in badges:
+            if badge_requirement(badge) is None:
+                print(f"⏭️  {badge.name}: criteria can't be evaluated, skipped.")
+                continue
+            awarded = backfill_badge(db, badge, args.chunk_size, args.after)
+            print(f"✅ {badge.name}: awarded to {awarded} users.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
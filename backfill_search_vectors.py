@@ -0,0 +1,116 @@
+"""
+Fill questions.search_vector and answers.search_vector for existing rows.
+
+New and edited rows are kept up to date by the triggers from migration
+f27a6c3e9b14; this only needs to run once after that migration (or with
+--all after changing the weighting). Rows are updated in small id-ordered
+batches, each in its own short transaction; a batch that waits on rows
+locked by live traffic is retried a few times, and the run stops rather
+than step past them. Interrupt it at any time and resume one table with
+--table and the printed --after.
+
+    python backfill_search_vectors.py [--table questions|answers [--after UUID]] [--all]
+"""
+import argparse
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.database import SessionLocal
+
+TABLES = {
+    "questions": "question_search_vector(t.title, t.body)",
+    "answers": "answer_search_vector(t.body)",
+}
+LOCK_NOT_AVAILABLE = "55P03"
+# Times a batch that hit lock_timeout is retried before the run stops
+RETRIES = 5
+
+
+def remaining_rows(db, table: str, rebuild: bool, after: str) -> int:
+    """Rows after `after` that still need a vector (all of them with rebuild)."""
+    only_missing = "" if rebuild else "AND search_vector IS NULL"
+    statement = text(f"""
+        SELECT COUNT(*) FROM {table}
+        WHERE (CAST(:after AS uuid) IS NULL OR id > CAST(:after AS uuid)) {only_missing}
+    """)
+    return db.execute(statement, {"after": after}).scalar()
+
+
+def backfill_table(db, table: str, batch_size: int, rebuild: bool, after: str, pause: float) -> tuple:
+    """Returns (rows updated, rows left without a vector)."""
+    vector_sql = TABLES[table]
+    only_missing = "" if rebuild else "AND search_vector IS NULL"
+    statement = text(f"""
+        WITH batch AS (
+            SELECT id FROM {table}
+            WHERE (CAST(:after AS uuid) IS NULL OR id > CAST(:after AS uuid)) {only_missing}
+            ORDER BY id
+            LIMIT :batch_size
+            FOR UPDATE
+        )
+        UPDATE {table} t SET search_vector = {vector_sql}
+        FROM batch
+        WHERE t.id = batch.id
+        RETURNING t.id
+    """)
+
+    updated = 0
+    failures = 0
+    started = time.monotonic()
+    while True:
+        try:
+            # Give up on a batch rather than queue behind live writers; the
+            # cursor only moves past rows that were written
+            db.execute(text("SET LOCAL lock_timeout = '2s'"))
+            ids = [row.id for row in db.execute(statement, {"after": after, "batch_size": batch_size})]
+            db.commit()
+        except OperationalError as e:
+            db.rollback()
+            if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE or failures == RETRIES:
+                left = remaining_rows(db, table, rebuild, after)
+                resume = f"--table {table}" + (f" --after {after}" if after else "")
+                print(f"❌ {table}: stopped with {left} rows left, resume with {resume}")
+                raise
+            failures += 1
+            time.sleep(pause + failures)
+            continue
+        failures = 0
+        if not ids:
+            break
+
+        updated += len(ids)
+        after = str(max(ids))
+        rate = updated / max(time.monotonic() - started, 1e-6)
+        print(f"{table}: {updated} rows ({rate:.0f}/s), resume with --table {table} --after {after}")
+        if pause:
+            time.sleep(pause)
+
+    # Anything a concurrent insert left without a vector, before the cursor too
+    return updated, 0 if rebuild else remaining_rows(db, table, rebuild, None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--table", choices=sorted(TABLES), help="Only backfill this table")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--all", action="store_true", help="Rebuild every vector, not just missing ones")
+    parser.add_argument("--after", help="Resume the --table run after this id")
+    parser.add_argument("--sleep", type=float, default=0.05, help="Pause between batches, in seconds")
+    args = parser.parse_args()
+    if args.after and not args.table:
+        # A resume point is only meaningful for the table that printed it
+        parser.error("--after requires --table")
+
+    db = SessionLocal()
+    try:
+        for table in [args.table] if args.table else sorted(TABLES, reverse=True):
+            updated, left = backfill_table(db, table, args.batch_size, args.all, args.after, args.sleep)
+            print(f"✅ {table}: {updated} search vectors written, {left} rows still without one.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
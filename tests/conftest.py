@@ -2,6 +2,39 @@ import pytest
 from fastapi.testclient import TestClient
 from app.main import app
 
+class FakeSession:
+    """
+    Stands in for a Session in the in-memory cache tests: every query returns
+    `rows`, and `on_query` runs as each query starts.
+    """
+
+    def __init__(self, rows=(), on_query=None):
+        self.rows = list(rows)
+        self.on_query = on_query
+        self.queries = 0
+
+    def query(self, *columns):
+        self.queries += 1
+        if self.on_query:
+            self.on_query()
+        return self
+
+    def filter(self, *criteria):
+        return self
+
+    def all(self):
+        return list(self.rows)
+
+    def __iter__(self):
+        return iter(self.all())
+
+    def scalar(self):
+        return self.rows[0][0] if self.rows else None
+
+@pytest.fixture
+def fake_session():
+    return FakeSession
+
 @pytest.fixture
 def client():
     with TestClient(app) as c:
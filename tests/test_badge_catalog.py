@@ -0,0 +1,33 @@
+import uuid
+
+from app.schemas.badge import Badge
+from app.services.badge_catalog import CatalogSnapshot
+
+
+def make_badge(name):
+    return Badge(id=uuid.uuid4(), name=name, description=None, criteria={}, category="participation", level="bronze")
+
+
+def test_eligible_returns_every_met_threshold():
+    first, tenth, hundredth, veteran = (make_badge(n) for n in ["First", "Tenth", "Hundredth", "Veteran"])
+    snapshot = CatalogSnapshot(
+        [first, tenth, hundredth, veteran],
+        {
+            hundredth.id: ("answers_posted", 100),
+            first.id: ("answers_posted", 1),
+            tenth.id: ("answers_posted", 10),
+            veteran.id: ("join_date", 365),
+        },
+    )
+
+    assert snapshot.eligible({"answers_posted": 0, "join_date": 3}) == []
+    assert snapshot.eligible({"answers_posted": 10, "join_date": 3}) == [first, tenth]
+    assert snapshot.eligible({"answers_posted": 250, "join_date": 400}) == [first, tenth, hundredth, veteran]
+
+
+def test_badges_without_a_requirement_are_listed_but_never_awarded():
+    manual = make_badge("Moderator")
+    snapshot = CatalogSnapshot([manual], {})
+
+    assert snapshot.badges == [manual]
+    assert snapshot.eligible({"answers_posted": 1000}) == []
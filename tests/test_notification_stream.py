@@ -0,0 +1,55 @@
+import asyncio
+import json
+import threading
+
+from app.services.notification_stream import broker, event_stream
+
+
+def parse(chunk):
+    event, data = chunk.strip().split("\n")
+    return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+def test_stream_sends_count_then_published_events():
+    async def scenario():
+        stream = event_stream("user-1", broker.subscribe("user-1"), unread=2, heartbeat=5)
+        assert parse(await stream.__anext__()) == ("unread", {"count": 2})
+
+        # Published from another thread, as the LISTEN thread does
+        event = {"unread": 3, "new": 1, "latest": {"id": "n-1", "message": "Someone answered"}}
+        threading.Thread(target=broker.publish, args=("user-1", event)).start()
+        threading.Thread(target=broker.publish, args=("user-2", {"unread": 9})).start()
+
+        assert parse(await stream.__anext__()) == (
+            "notification", {"new": 1, "id": "n-1", "message": "Someone answered"}
+        )
+        assert parse(await stream.__anext__()) == ("unread", {"count": 3})
+        await stream.aclose()
+
+    asyncio.run(scenario())
+    assert "user-1" not in broker._subscribers
+
+
+def test_idle_stream_sends_heartbeats():
+    async def scenario():
+        stream = event_stream("user-3", broker.subscribe("user-3"), unread=0, heartbeat=0.01)
+        await stream.__anext__()
+        assert await stream.__anext__() == ": keep-alive\n\n"
+        await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_events_published_while_count_loads_are_kept():
+    async def scenario():
+        queue = broker.subscribe("user-4")
+        # Published after subscribing but before the stream starts
+        broker.publish("user-4", {"unread": 5})
+        await asyncio.sleep(0)
+        stream = event_stream("user-4", queue, unread=4, heartbeat=5)
+        assert parse(await stream.__anext__()) == ("unread", {"count": 4})
+        assert parse(await stream.__anext__()) == ("unread", {"count": 5})
+        await stream.aclose()
+
+    asyncio.run(scenario())
+    assert "user-4" not in broker._subscribers
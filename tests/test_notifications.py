@@ -0,0 +1,71 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.crud import notification as crud_notification
+from app.models import Notification, NotificationCounter, NotificationType
+from app.schemas.question import TotalMode
+
+
+@pytest.fixture
+def db():
+    """A throwaway SQLite session holding just the inbox tables."""
+    engine = create_engine("sqlite://")
+    Notification.__table__.create(engine)
+    NotificationCounter.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def add_notifications(db, user_id, count, is_read=False):
+    start = datetime(2025, 5, 7, 19, 19, 49)
+    for i in range(count):
+        db.add(Notification(
+            user_id=user_id,
+            type=NotificationType.answer_posted,
+            message=f"n{i}",
+            is_read=is_read,
+            created_at=start + timedelta(minutes=i),
+        ))
+    db.commit()
+
+
+def test_inbox_only_lists_the_users_notifications(db):
+    user_id = uuid.uuid4()
+    add_notifications(db, user_id, 2)
+    add_notifications(db, uuid.uuid4(), 3)
+
+    page = crud_notification.get_notifications_for_user(db, user_id)
+
+    assert page["total"] == 2
+    assert {n.user_id for n in page["items"]} == {user_id}
+
+
+def test_unread_total_comes_from_the_counter(db):
+    user_id = uuid.uuid4()
+    add_notifications(db, user_id, 2)
+    add_notifications(db, user_id, 2, is_read=True)
+    # Deliberately off from the rows: the total must be the counter's
+    db.add(NotificationCounter(user_id=user_id, unread=7))
+    db.commit()
+
+    page = crud_notification.get_notifications_for_user(db, user_id, unread_only=True)
+
+    assert page["total"] == 7
+    assert [n.message for n in page["items"]] == ["n1", "n0"]
+    assert all(not n.is_read for n in page["items"])
+
+
+def test_estimated_total_uses_the_planner(db, monkeypatch):
+    user_id = uuid.uuid4()
+    add_notifications(db, user_id, 2)
+    monkeypatch.setattr(crud_notification, "estimate_query_rows", lambda db, query: 40)
+
+    page = crud_notification.get_notifications_for_user(db, user_id, total=TotalMode.estimate)
+
+    assert page["total"] == 40
+    assert len(page["items"]) == 2
@@ -0,0 +1,68 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import Column, DateTime, String, Uuid, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from app.models import Question
+from app.services.pagination import encode_cursor, decode_cursor, keyset_paginate
+
+COLUMNS = (Question.created_at, Question.id)
+
+ItemBase = declarative_base()
+
+
+class Item(ItemBase):
+    """A minimal keyset-paged table that SQLite can hold."""
+    __tablename__ = "items"
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    name = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    ItemBase.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 5, 7, 19, 19, 49, 118080)
+    question_id = uuid.uuid4()
+
+    cursor = encode_cursor([created_at, question_id])
+
+    assert decode_cursor(cursor, COLUMNS) == (created_at, question_id)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    encode_cursor(["2025-05-07T19:19:49"]),
+    encode_cursor(["yesterday", "x"]),
+    encode_cursor(["2025-01-01T00:00:00", 5]),
+])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, COLUMNS)
+
+
+def test_skip_pages_without_cursor(db):
+    start = datetime(2025, 5, 7, 19, 19, 49)
+    db.add_all([Item(name=f"i{i}", created_at=start + timedelta(minutes=i)) for i in range(5)])
+    db.commit()
+
+    query = db.query(Item)
+    columns = (Item.created_at, Item.id)
+
+    items, next_cursor = keyset_paginate(query, columns, skip=2, limit=2)
+    assert [item.name for item in items] == ["i2", "i1"]
+
+    # The cursor from an offset page continues where it left off
+    items, next_cursor = keyset_paginate(query, columns, cursor=next_cursor, limit=2)
+    assert [item.name for item in items] == ["i0"]
+    assert next_cursor is None
@@ -0,0 +1,22 @@
+from app.schemas.question import SearchMode
+from app.services.search import build_tsquery
+
+
+def test_websearch_passes_raw_input_as_parameter():
+    sql, params = build_tsquery('"fastapi" -flask (async)', SearchMode.websearch)
+
+    assert "websearch_to_tsquery" in sql
+    assert params == {"query": '"fastapi" -flask (async)'}
+
+
+def test_prefix_mode_matches_last_word_as_prefix():
+    sql, params = build_tsquery("sqlalchemy sess", SearchMode.prefix)
+
+    assert "to_tsquery('english', :prefix)" in sql
+    assert params == {"head": "sqlalchemy ", "prefix": "sess:*"}
+
+
+def test_prefix_mode_ignores_punctuation_only_input():
+    sql, params = build_tsquery("&&!", SearchMode.prefix)
+
+    assert params == {"query": "&&!"}
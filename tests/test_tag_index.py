@@ -0,0 +1,43 @@
+import uuid
+
+from app.services.tag_index import TagIndex
+
+TAGS = [(uuid.uuid4(), name) for name in ["React", "Next.js", "Node.js", "NestJS", "Django", "react-native"]]
+
+
+def test_autocomplete_is_case_insensitive_and_ordered(fake_session):
+    index = TagIndex()
+    db = fake_session(TAGS)
+
+    assert [t.name for t in index.autocomplete(db, "ne")] == ["NestJS", "Next.js"]
+    assert [t.name for t in index.autocomplete(db, "REACT", limit=1)] == ["React"]
+    assert index.autocomplete(db, "vue") == []
+
+
+def test_lookups_reuse_the_cache_until_invalidated(fake_session):
+    index = TagIndex()
+    db = fake_session(TAGS)
+
+    index.autocomplete(db, "n")
+    index.fuzzy(db, "djang")
+    assert db.queries == 1
+
+    index.invalidate()
+    index.autocomplete(db, "n")
+    assert db.queries == 2
+
+
+def test_fuzzy_matches_partial_names(fake_session):
+    index = TagIndex()
+
+    assert "Django" in [t.name for t in index.fuzzy(fake_session(TAGS), "djang")]
+
+
+def test_invalidate_during_a_load_discards_its_snapshot(fake_session):
+    index = TagIndex()
+    # A tag is created and invalidates the index while the load is querying
+    db = fake_session(TAGS, on_query=lambda: index.invalidate() if db.queries == 1 else None)
+
+    index.autocomplete(db, "n")
+    index.autocomplete(db, "n")
+    assert db.queries == 2
@@ -0,0 +1,49 @@
+import json
+import uuid
+
+from app.services.notification_stream import NotificationBroker, NotificationListener
+from app.services.unread_counts import UnreadCountCache, unread_counts
+
+
+def test_counts_are_cached_until_invalidated(fake_session):
+    cache = UnreadCountCache(ttl=60)
+    user_id = uuid.uuid4()
+    db = fake_session([(3,)])
+
+    assert cache.get(db, user_id) == 3
+    db.rows = [(4,)]
+    assert cache.get(db, user_id) == 3
+    assert db.queries == 1
+
+    cache.invalidate(user_id)
+    assert cache.get(db, user_id) == 4
+    assert db.queries == 2
+
+
+def test_missing_counter_reads_as_zero(fake_session):
+    cache = UnreadCountCache(ttl=0)
+    assert cache.get(fake_session(), uuid.uuid4()) == 0
+
+
+def test_invalidate_during_a_read_is_not_lost(fake_session):
+    cache = UnreadCountCache(ttl=60)
+    user_id = uuid.uuid4()
+    # The count changes and is invalidated while the first read is in flight
+    db = fake_session([(3,)], on_query=lambda: cache.invalidate(user_id) if db.queries == 1 else None)
+
+    assert cache.get(db, user_id) == 3
+    db.rows = [(4,)]
+    assert cache.get(db, user_id) == 4
+    assert db.queries == 2
+
+
+def test_listener_events_invalidate_cached_counts(fake_session):
+    user_id = uuid.uuid4()
+    db = fake_session([(1,)])
+    unread_counts.get(db, user_id)
+
+    NotificationListener(NotificationBroker())._forward(json.dumps({"user_id": str(user_id), "unread": 2}))
+    db.rows = [(2,)]
+
+    assert unread_counts.get(db, user_id) == 2
+    assert db.queries == 2
@@ -0,0 +1,38 @@
+import uuid
+
+import pytest
+
+from app.services.user_index import UserNameIndex
+
+ALICE, BOB, CAROL = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+
+@pytest.fixture
+def index(fake_session):
+    index = UserNameIndex()
+    index.rebuild(fake_session([(ALICE, "alice", "Alice Liddell"), (BOB, "bobby", None)]))
+    return index
+
+
+def test_search_matches_username_and_display_name(index):
+    assert [user_id for user_id, _ in index.search("liddell")] == [ALICE]
+    assert [user_id for user_id, _ in index.search("BOBBY")] == [BOB]
+
+
+def test_upsert_adds_and_renames_users(index):
+    index.upsert(CAROL, "carol", "Carol Danvers")
+    index.upsert(BOB, "robert", None)
+
+    assert [user_id for user_id, _ in index.search("danvers")] == [CAROL]
+    assert [user_id for user_id, _ in index.search("robert")] == [BOB]
+    assert index.search("bobby", threshold=90) == []
+
+
+def test_remove_keeps_remaining_users_searchable(index):
+    index.upsert(CAROL, "carol", None)
+
+    index.remove(ALICE)
+
+    assert index.search("alice", threshold=90) == []
+    assert [user_id for user_id, _ in index.search("carol")] == [CAROL]
+    assert [user_id for user_id, _ in index.search("bobby")] == [BOB]